@@ -17,7 +17,7 @@ from typing import List, Optional, Tuple
 
 # 导入 Git 工具类
 try:
-    from git_utils import GitRemote
+    from git_utils import GitRemote, nonempty_lines
 except ImportError:
     # 如果无法导入，使用备用实现
     class GitRemote:
@@ -44,51 +44,239 @@ except ImportError:
             GitRemote._remote_name_cache = "origin"
             return GitRemote._remote_name_cache
 
+    def nonempty_lines(s):
+        return [line.strip() for line in s.splitlines() if line.strip()]
+
 
 class BranchSelector:
     """分支选择器"""
 
-    def __init__(self, non_interactive: bool = False):
+    # 类级分支缓存：同一次运行中重复实例化时跳过 git 子进程
+    # 键为 (工作目录, .git/HEAD mtime, .git/packed-refs mtime)
+    _branch_cache = {}
+
+    def __init__(self, non_interactive: bool = False, refresh: bool = False):
         """
         初始化分支选择器
 
         Args:
             non_interactive: 是否为非交互式模式
+            refresh: 是否直接查询远程（git ls-remote），
+                     默认读取本地引用（可能滞后于远程，需先 git fetch）
         """
         self.non_interactive = non_interactive
+        self.refresh = refresh
         self.current_branch = ""
         self.remote_branches = []
         self.remote_name = GitRemote.get_remote_name()
         self._load_branches()
 
+    @staticmethod
+    def _cache_key():
+        """
+        生成分支缓存键
+
+        使用 .git/HEAD 和 .git/packed-refs 的 mtime，
+        分支切换或引用更新后缓存自动失效
+
+        Returns:
+            缓存键元组，无法生成时返回 None
+        """
+        from pathlib import Path
+
+        git_dir = Path.cwd() / ".git"
+        if not git_dir.is_dir():
+            return None
+
+        def _mtime(p):
+            try:
+                return p.stat().st_mtime_ns
+            except OSError:
+                return 0
+
+        return (
+            str(Path.cwd()),
+            _mtime(git_dir / "HEAD"),
+            _mtime(git_dir / "packed-refs"),
+        )
+
     def _load_branches(self):
-        """加载分支信息"""
-        # 获取当前分支
+        """加载分支信息（带类级缓存）"""
+        # refresh 模式：直接查询远程，保证分支列表不滞后
+        if self.refresh:
+            self.current_branch = self._read_head_branch() or ""
+            self.remote_branches = self._load_remote_branches_via_ls_remote()
+            return
+
+        cache_key = self._cache_key()
+        cached = BranchSelector._branch_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            self.current_branch, self.remote_branches = cached
+            # 返回副本，避免调用方修改缓存
+            self.remote_branches = list(self.remote_branches)
+            return
+
+        # 优先直接读取 .git 下的引用文件，完全避免 fork+exec
+        loaded = self._load_branches_from_refs()
+        if loaded:
+            if cache_key:
+                BranchSelector._branch_cache[cache_key] = (
+                    self.current_branch,
+                    tuple(self.remote_branches),
+                )
+            return
+
+        # 一次 for-each-ref 同时取当前分支和远程分支，
+        # 替代原来的 git branch --show-current + git branch -r 两次子进程
         result = subprocess.run(
-            ["git", "branch", "--show-current"],
+            [
+                "git", "for-each-ref",
+                "--format=%(refname)%00%(refname:short)%00%(HEAD)",
+                "refs/heads", "refs/remotes",
+            ],
             capture_output=True,
             text=True,
             check=False
         )
-        self.current_branch = result.stdout.strip()
 
-        # 获取所有远程分支
+        remote_prefix = f"{self.remote_name}/"
+        self.current_branch = ""
+        self.remote_branches = []
+
+        for line in nonempty_lines(result.stdout):
+            parts = line.split("\0")
+            if len(parts) != 3:
+                continue
+
+            refname, short_name, head_marker = parts
+
+            if refname.startswith("refs/heads/"):
+                # HEAD 标记为 * 的本地分支即当前分支
+                if head_marker == "*":
+                    self.current_branch = short_name
+            elif refname.startswith("refs/remotes/"):
+                # 过滤掉 HEAD 符号引用，只保留分支名
+                if refname.endswith("/HEAD"):
+                    continue
+                # 使用自动检测的远程名称移除前缀
+                if short_name.startswith(remote_prefix):
+                    short_name = short_name[len(remote_prefix):]
+                self.remote_branches.append(short_name)
+
+        if cache_key:
+            BranchSelector._branch_cache[cache_key] = (
+                self.current_branch,
+                tuple(self.remote_branches),
+            )
+
+    @staticmethod
+    def _git_dir():
+        """
+        获取 .git 目录路径
+
+        Returns:
+            .git 目录路径，非普通目录（worktree/submodule）时返回 None
+        """
+        from pathlib import Path
+
+        git_dir = Path.cwd() / ".git"
+        return git_dir if git_dir.is_dir() else None
+
+    def _read_head_branch(self):
+        """
+        直接读取 .git/HEAD 获取当前分支名
+
+        Returns:
+            当前分支名，detached HEAD 或读取失败时返回 None
+        """
+        git_dir = self._git_dir()
+        if git_dir is None:
+            return None
+
+        try:
+            head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+        except OSError:
+            return None
+
+        if head.startswith("ref: refs/heads/"):
+            return head[len("ref: refs/heads/"):]
+        return None
+
+    def _load_branches_from_refs(self) -> bool:
+        """
+        直接读取引用文件加载分支信息（不启动子进程）
+
+        读取 .git/HEAD、.git/packed-refs 和 .git/refs/remotes/<remote>/
+
+        Returns:
+            是否加载成功（失败时调用方回退到 git for-each-ref）
+        """
+        git_dir = self._git_dir()
+        if git_dir is None:
+            return False
+
+        current = self._read_head_branch()
+        if current is None:
+            return False
+
+        remote_ref_prefix = f"refs/remotes/{self.remote_name}/"
+        branches = set()
+
+        # packed-refs：每行 "<sha> <refname>"
+        packed_refs = git_dir / "packed-refs"
+        if packed_refs.exists():
+            try:
+                for line in packed_refs.read_text(encoding="utf-8").splitlines():
+                    if line.startswith("#") or line.startswith("^"):
+                        continue
+                    parts = line.split(" ", 1)
+                    if len(parts) != 2:
+                        continue
+                    refname = parts[1].strip()
+                    if refname.startswith(remote_ref_prefix) and not refname.endswith("/HEAD"):
+                        branches.add(refname[len(remote_ref_prefix):])
+            except OSError:
+                return False
+
+        # 松散引用：refs/remotes/<remote>/ 下的文件
+        loose_dir = git_dir / "refs" / "remotes" / self.remote_name
+        if loose_dir.is_dir():
+            try:
+                for path in loose_dir.rglob("*"):
+                    if path.is_file() and path.name != "HEAD":
+                        branches.add(str(path.relative_to(loose_dir)))
+            except OSError:
+                return False
+
+        self.current_branch = current
+        self.remote_branches = sorted(branches)
+        return True
+
+    def _load_remote_branches_via_ls_remote(self) -> List[str]:
+        """
+        通过 git ls-remote --heads 查询远程分支列表
+
+        Returns:
+            远程分支名列表（查询失败时返回空列表）
+        """
         result = subprocess.run(
-            ["git", "branch", "-r"],
+            ["git", "ls-remote", "--heads", self.remote_name],
             capture_output=True,
             text=True,
             check=False
         )
-        branches = result.stdout.strip().split("\n")
 
-        # 过滤掉 HEAD，只保留分支名
-        # 使用自动检测的远程名称移除前缀
-        remote_prefix = f"{self.remote_name}/"
-        self.remote_branches = [
-            b.replace(remote_prefix, "").strip()
-            for b in branches
-            if b.strip() and "HEAD" not in b
-        ]
+        if result.returncode != 0:
+            return []
+
+        branches = []
+        for line in result.stdout.splitlines():
+            # 每行格式: <sha>\trefs/heads/<name>
+            parts = line.split("\t", 1)
+            if len(parts) == 2 and parts[1].startswith("refs/heads/"):
+                branches.append(parts[1][len("refs/heads/"):])
+
+        return branches
 
     def get_branches(self) -> Tuple[str, List[str]]:
         """
@@ -189,29 +377,90 @@ class BranchSelector:
 
         return self.remote_branches[index - 1]
 
-    def check_commits_ahead(self, target_branch: str) -> Tuple[int, List[str]]:
+    def count_commits_ahead(self, target_branch: str) -> int:
         """
-        检查当前分支相对于目标分支的新提交数量
+        统计当前分支相对于目标分支的新提交数量
+
+        使用 git rev-list --count，只返回一个整数，
+        不传输也不解析完整提交列表
 
         Args:
             target_branch: 目标分支名
 
         Returns:
-            (新提交数量, 提交列表)
+            新提交数量
         """
         result = subprocess.run(
-            ["git", "log", f"{target_branch}..HEAD", "--oneline"],
+            ["git", "rev-list", "--count", f"{target_branch}..HEAD"],
             capture_output=True,
             text=True,
             check=False
         )
 
-        commits = result.stdout.strip().split("\n") if result.stdout.strip() else []
+        output = result.stdout.strip()
+        return int(output) if output.isdigit() else 0
 
-        # 移除空行
-        commits = [c for c in commits if c.strip()]
+    def list_commits_ahead(self, target_branch: str,
+                           limit: Optional[int] = None) -> List[Tuple[str, str]]:
+        """
+        列出当前分支相对于目标分支的新提交
 
-        return len(commits), commits
+        Args:
+            target_branch: 目标分支名
+            limit: 最多返回的提交数量（None 表示全部）
+
+        Returns:
+            (短哈希, 提交说明) 元组列表
+        """
+        args = ["git", "log", f"{target_branch}..HEAD", "--format=%h%x09%s"]
+        if limit is not None:
+            args.extend(["-n", str(limit)])
+
+        result = subprocess.run(
+            args,
+            capture_output=True,
+            text=True,
+            check=False
+        )
+
+        commits = []
+        for line in result.stdout.splitlines():
+            parts = line.split("\t", 1)
+            if len(parts) == 2:
+                commits.append((parts[0], parts[1]))
+
+        return commits
+
+    # check_commits_ahead 返回列表的上限：调用方只展示最新几条，
+    # 分支领先数千提交时不必让 git log 输出全部 subject
+    MAX_LISTED_COMMITS = 1000
+
+    def check_commits_ahead(self, target_branch: str) -> Tuple[int, List[str]]:
+        """
+        检查当前分支相对于目标分支的新提交数量
+
+        rev-list --count 先短路（单个整数，一次子进程）；
+        需要列表时按 count 与上限的较小值一次取齐，
+        不做逐页多次 git log 的串行拉取
+
+        Args:
+            target_branch: 目标分支名
+
+        Returns:
+            (新提交数量, 提交列表)；列表最多 MAX_LISTED_COMMITS 条，
+            总数以返回的 count 为准
+        """
+        count = self.count_commits_ahead(target_branch)
+        if count == 0:
+            return 0, []
+
+        commits = [
+            f"{short_hash} {subject}"
+            for short_hash, subject in self.list_commits_ahead(
+                target_branch, limit=min(count, self.MAX_LISTED_COMMITS)
+            )
+        ]
+        return count, commits
 
 
 def main():
@@ -222,12 +471,12 @@ def main():
     print(f"当前分支: {current}")
     print(f"可用分支: {len(branches)} 个")
 
-    # 检查是否有新提交
+    # 检查是否有新提交（只需数量时用 count，展示时限制条数）
     if branches:
-        count, commits = selector.check_commits_ahead(branches[0])
+        count = selector.count_commits_ahead(branches[0])
         print(f"\n相对于 {branches[0]} 的新提交: {count} 个")
-        for commit in commits[:5]:
-            print(f"  - {commit}")
+        for short_hash, subject in selector.list_commits_ahead(branches[0], limit=5):
+            print(f"  - {short_hash} {subject}")
 
     # 选择分支
     selected = selector.select_branch()
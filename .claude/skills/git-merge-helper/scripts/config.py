@@ -11,9 +11,17 @@ Generated: 2026-01-04
 """
 
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import ClassVar, List, Optional
 import json
+import os
+
+# 可选依赖：orjson 解析速度约为标准库的 2-3 倍，且直接读取字节流
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # 导入 Git 工具类
 try:
@@ -47,6 +55,60 @@ except ImportError:
             )
 
 
+def _scan_for_config(directory: Path) -> Optional[Path]:
+    """
+    在目录中查找 config.json
+
+    使用 os.scandir：目录项自带 stat 缓存，
+    比 iterdir + exists 少一次 stat 系统调用
+
+    Args:
+        directory: 待查找的目录
+
+    Returns:
+        config.json 路径，不存在时返回 None
+    """
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name == "config.json" and entry.is_file(follow_symlinks=False):
+                    return Path(entry.path)
+    except OSError:
+        # 目录不存在或不可读
+        return None
+    return None
+
+
+@lru_cache(maxsize=1)
+def _find_config_file_cached(cwd: Path) -> Optional[Path]:
+    """
+    查找配置文件（按当前目录缓存查找结果）
+
+    查找顺序：
+    1. Git 仓库内 .claude/skills/git-merge-helper/config.json
+    2. 用户配置目录 $XDG_CONFIG_HOME/git-merge-helper/（默认 ~/.config）
+
+    Args:
+        cwd: 当前工作目录（作为缓存键）
+
+    Returns:
+        配置文件路径或 None
+    """
+    # 尝试找到 Git 仓库根目录
+    repo_root = GitRepository.find_root_safe()
+    if repo_root is not None:
+        config_file = _scan_for_config(
+            repo_root / ".claude" / "skills" / "git-merge-helper"
+        )
+        if config_file is not None:
+            return config_file
+
+    # 回退到用户配置目录
+    xdg_config = os.environ.get("XDG_CONFIG_HOME", "").strip()
+    config_home = Path(xdg_config) if xdg_config else Path.home() / ".config"
+    return _scan_for_config(config_home / "git-merge-helper")
+
+
 @dataclass
 class MergeConfig:
     """合并配置类"""
@@ -61,6 +123,15 @@ class MergeConfig:
     network_timeout: int = 30
     """网络操作超时时间（秒）"""
 
+    ls_remote_cache_ttl: int = 60
+    """远程分支查询（ls-remote）结果缓存时间（秒）"""
+
+    op_timeouts: dict = field(default_factory=dict)
+    """按操作覆盖超时时间（秒），如 {"ls-remote": 10, "fetch": 120}"""
+
+    lock_timeout_s: float = 2.0
+    """合并锁竞争时的重试总预算（秒），0 表示失败立即返回"""
+
     # ==================== 日志清理配置 ====================
     max_week_logs: int = 10
     """一周内最多保留的日志数量"""
@@ -82,11 +153,20 @@ class MergeConfig:
     max_conflict_file_size: int = 10 * 1024 * 1024
     """冲突文件最大大小（10MB），超过则提示手动处理"""
 
+    # 进程级配置缓存：同一次运行中多个组件加载配置只解析一次
+    _cached: ClassVar[Optional['MergeConfig']] = None
+
     def __post_init__(self):
         """初始化后处理，设置默认值"""
         if not self.protected_branches:
             self.protected_branches = ["pre", "prod", "production", "master-prod", "pre-prod"]
 
+    def __setattr__(self, name, value):
+        """任一配置项变更时使摘要缓存失效"""
+        super().__setattr__(name, value)
+        if name != "_summary_cache":
+            super().__setattr__("_summary_cache", None)
+
     @classmethod
     def load(cls, config_path: Optional[Path] = None) -> 'MergeConfig':
         """
@@ -97,18 +177,45 @@ class MergeConfig:
 
         Returns:
             配置对象
+
+        Note:
+            未指定 config_path 时结果会被缓存，
+            同一进程内重复调用不会再次读取和解析文件
         """
-        # 如果未指定配置文件路径，自动查找
+        # 如果未指定配置文件路径，自动查找（带进程级缓存）
         if config_path is None:
+            if cls._cached is not None:
+                return cls._cached
             config_path = cls._find_config_file()
+            config = cls._load_from_file(config_path)
+            cls._cached = config
+            return config
+
+        return cls._load_from_file(config_path)
+
+    @classmethod
+    def _load_from_file(cls, config_path: Optional[Path]) -> 'MergeConfig':
+        """
+        从指定文件加载配置
+
+        Args:
+            config_path: 配置文件路径（可为 None）
 
+        Returns:
+            配置对象
+        """
         # 如果找到配置文件，加载它
         if config_path and config_path.exists():
             try:
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                # orjson 可用时直接解析字节流，跳过文本解码
+                if orjson is not None:
+                    with open(config_path, 'rb') as f:
+                        data = orjson.loads(f.read())
+                else:
+                    with open(config_path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
                 return cls(**data)
-            except (json.JSONDecodeError, TypeError) as e:
+            except (json.JSONDecodeError, ValueError, TypeError) as e:
                 print(f"⚠️  配置文件格式错误: {e}")
                 print(f"   使用默认配置")
                 return cls()
@@ -123,7 +230,7 @@ class MergeConfig:
     @classmethod
     def _find_config_file(cls) -> Optional[Path]:
         """
-        查找配置文件
+        查找配置文件（按当前目录缓存）
 
         从当前目录开始向上查找，直到找到配置文件或到达根目录
         限制遍历深度防止无限循环
@@ -131,18 +238,7 @@ class MergeConfig:
         Returns:
             配置文件路径或 None
         """
-        # 尝试找到 Git 仓库根目录
-        repo_root = GitRepository.find_root_safe()
-        if repo_root is None:
-            # 未找到 Git 仓库，不遍历
-            return None
-
-        # 在 Git 仓库中查找配置文件
-        config_file = repo_root / ".claude" / "skills" / "git-merge-helper" / "config.json"
-        if config_file.exists():
-            return config_file
-
-        return None
+        return _find_config_file_cached(Path.cwd())
 
     def save(self, config_path: Optional[Path] = None):
         """
@@ -163,6 +259,9 @@ class MergeConfig:
             'max_retries': self.max_retries,
             'retry_delay': self.retry_delay,
             'network_timeout': self.network_timeout,
+            'ls_remote_cache_ttl': self.ls_remote_cache_ttl,
+            'op_timeouts': self.op_timeouts,
+            'lock_timeout_s': self.lock_timeout_s,
             'max_week_logs': self.max_week_logs,
             'max_month_logs': self.max_month_logs,
             'week_days': self.week_days,
@@ -176,12 +275,16 @@ class MergeConfig:
 
     def get_summary(self) -> str:
         """
-        获取配置摘要
+        获取配置摘要（惰性缓存，配置变更后自动重建）
 
         Returns:
             配置摘要文本
         """
-        return f"""
+        cached = getattr(self, "_summary_cache", None)
+        if cached is not None:
+            return cached
+
+        summary = f"""
 📋 Git Merge Helper 配置
 {'=' * 50}
 
@@ -202,6 +305,9 @@ class MergeConfig:
   • 冲突文件最大大小: {self.max_conflict_file_size / 1024 / 1024:.0f} MB
 """
 
+        super().__setattr__("_summary_cache", summary)
+        return summary
+
 
 def main():
     """命令行入口（用于测试）"""
@@ -10,9 +10,55 @@ Git Merge Helper - 冲突检测器
 Generated: 2026-01-04
 """
 
+import re
 import subprocess
 import sys
-from typing import List, Dict, Tuple
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+
+
+# 预编译的冲突块正则：<<<<<<< ... ======= ... >>>>>>> 整块匹配
+_CONFLICT_RE = re.compile(
+    r"^<{7}.*?^={7}.*?^>{7}.*?$",
+    re.DOTALL | re.MULTILINE
+)
+
+# 导入输出解析辅助函数
+try:
+    from git_utils import nonempty_lines
+except ImportError:
+    # 如果无法导入，使用备用实现
+    def nonempty_lines(s):
+        return [line.strip() for line in s.splitlines() if line.strip()]
+
+
+# 模块级缓存的 .git/index 路径（每个进程只执行一次 rev-parse）
+_git_index_path_cache = None
+
+
+def _git_index_path():
+    """
+    获取 .git/index 文件路径（模块级缓存）
+
+    Returns:
+        index 文件路径，不在 Git 仓库中时返回 None
+    """
+    global _git_index_path_cache
+    if _git_index_path_cache is not None:
+        return _git_index_path_cache
+
+    result = subprocess.run(
+        ["git", "rev-parse", "--git-dir"],
+        capture_output=True,
+        text=True,
+        check=False
+    )
+
+    if result.returncode != 0 or not result.stdout.strip():
+        return None
+
+    _git_index_path_cache = Path(result.stdout.strip()) / "index"
+    return _git_index_path_cache
 
 
 class ConflictChecker:
@@ -23,13 +69,35 @@ class ConflictChecker:
         self.conflicted_files = []
         self.conflict_details = {}
 
+        # check_conflicts 结果缓存，以 .git/index 的 mtime 判断失效
+        self._last_index_mtime = None
+        self._cached_conflicted = None
+
     def check_conflicts(self) -> bool:
         """
         检查是否有冲突
 
+        结果按 .git/index 的 mtime 缓存：重复调用（如刷新/重试场景）
+        在索引未变化时不再启动 git 子进程
+
         Returns:
             True 如果有冲突，False 如果没有冲突
         """
+        index_path = _git_index_path()
+        index_mtime = None
+        if index_path is not None:
+            try:
+                index_mtime = index_path.stat().st_mtime_ns
+            except OSError:
+                index_mtime = None
+
+        # 索引未变化，直接返回缓存结果
+        if (self._cached_conflicted is not None
+                and index_mtime is not None
+                and index_mtime == self._last_index_mtime):
+            self.conflicted_files = list(self._cached_conflicted)
+            return len(self.conflicted_files) > 0
+
         result = subprocess.run(
             ["git", "diff", "--name-only", "--diff-filter=U"],
             capture_output=True,
@@ -37,13 +105,56 @@ class ConflictChecker:
             check=False
         )
 
-        self.conflicted_files = [
-            f for f in result.stdout.strip().split("\n")
-            if f.strip()
-        ]
+        self.conflicted_files = nonempty_lines(result.stdout)
+
+        # 更新缓存；冲突集变化后旧的详情解析也随之失效
+        self._last_index_mtime = index_mtime
+        self._cached_conflicted = list(self.conflicted_files)
+        self.conflict_details = {}
 
         return len(self.conflicted_files) > 0
 
+    def probe_conflicts_via_merge_tree(self, branch_a: str,
+                                       branch_b: str) -> Optional[List[str]]:
+        """
+        用 merge-tree 预探测两个分支合并是否冲突
+
+        git merge-tree --write-tree 在对象库内模拟整个合并，
+        不触碰工作区和索引：一次只读调用即可预知冲突，
+        无须真实 merge 再回滚
+
+        Args:
+            branch_a: 合并的一方（通常为目标分支）
+            branch_b: 合并的另一方（通常为当前分支）
+
+        Returns:
+            冲突文件列表（空列表表示无冲突）；
+            无法判断时（如旧版 git 不支持 --write-tree）返回 None，
+            由调用方回退到真实合并路径
+        """
+        result = subprocess.run(
+            ["git", "merge-tree", "--write-tree", "--name-only",
+             branch_a, branch_b],
+            capture_output=True,
+            text=True,
+            check=False
+        )
+
+        # 退出码约定：0 无冲突，1 有冲突，其余为执行失败
+        if result.returncode == 0:
+            return []
+        if result.returncode != 1:
+            return None
+
+        # --name-only 输出：首行为树 OID，随后每行一个冲突文件名，
+        # 空行之后是提示性消息
+        files = []
+        for line in result.stdout.splitlines()[1:]:
+            if not line.strip():
+                break
+            files.append(line.strip())
+        return files or None
+
     def get_conflicted_files(self) -> List[str]:
         """
         获取冲突文件列表
@@ -57,53 +168,43 @@ class ConflictChecker:
         """
         获取指定文件的冲突详情
 
+        冲突标记由 git 直接写入工作区文件，无需再调用 git diff，
+        直接读取文件内容即可。解析结果会缓存，重复调用不会重新解析。
+
         Args:
             file_path: 文件路径
 
         Returns:
             冲突详情字典
         """
-        result = subprocess.run(
-            ["git", "diff", file_path],
-            capture_output=True,
-            text=True,
-            check=False
-        )
+        # 命中缓存，直接返回
+        if file_path in self.conflict_details:
+            return self.conflict_details[file_path]
+
+        try:
+            content = Path(file_path).read_text(encoding="utf-8", errors="ignore")
+        except OSError:
+            content = ""
 
-        content = result.stdout
         if not content:
+            # 空结果同样缓存，避免重复读取不存在/空的文件
+            self.conflict_details[file_path] = {}
             return {}
 
-        # 解析冲突内容
-        lines = content.split("\n")
-        conflicts = []
-        current_conflict = []
-
-        in_conflict = False
-        marker_count = 0
-
-        for line in lines:
-            if line.startswith("<<<<<<<") or line.startswith(">>>>>>>") or line.startswith("======="):
-                marker_count += 1
-                if line.startswith("<<<<<<<"):
-                    in_conflict = True
-                    current_conflict = [line]
-                elif line.startswith("======="):
-                    current_conflict.append(line)
-                elif line.startswith(">>>>>>>"):
-                    current_conflict.append(line)
-                    in_conflict = False
-                    conflicts.append("\n".join(current_conflict))
-                    current_conflict = []
-            elif in_conflict:
-                current_conflict.append(line)
-
-        return {
+        # 解析冲突内容：单次正则扫描提取所有完整冲突块，
+        # 替代逐行状态机（匹配在 C 层完成，且不受标记残缺影响）
+        conflicts = _CONFLICT_RE.findall(content)
+
+        details = {
             "file": file_path,
             "conflict_count": len(conflicts),
             "conflicts": conflicts
         }
 
+        # 缓存解析结果，analyze_conflicts 和 format_conflict_report 共用
+        self.conflict_details[file_path] = details
+        return details
+
     def analyze_conflicts(self) -> List[Dict]:
         """
         分析所有冲突
@@ -10,8 +10,11 @@ Git Merge Helper - 冲突解决建议器
 Generated: 2026-01-04
 """
 
+import mmap
 import os
+import re
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, TYPE_CHECKING
@@ -46,6 +49,14 @@ class ConflictResolver:
         else:
             self.protected_branches = self.DEFAULT_PROTECTED_BRANCHES.copy()
 
+        # 预编译受保护分支匹配：精确匹配走 frozenset，
+        # 前缀/后缀变体编译成一个正则，避免每次调用的嵌套循环
+        self._protected_exact = frozenset(p.lower() for p in self.protected_branches)
+        alternation = "|".join(re.escape(p.lower()) for p in self.protected_branches)
+        self._protected_re = re.compile(
+            rf"^(?:{alternation})[/_-]|[-_](?:{alternation})$"
+        )
+
         # 从配置获取最大文件大小限制
         if config:
             self.max_file_size = config.max_conflict_file_size
@@ -66,21 +77,11 @@ class ConflictResolver:
         """
         branch_lower = branch.lower()
 
-        # 为每个受保护分支生成常见变体
-        for protected in self.protected_branches:
-            protected_lower = protected.lower()
-            # 精确匹配
-            if branch_lower == protected_lower:
-                return True
-            # 常见前缀/后缀变体
-            if (branch_lower.startswith(protected_lower + "/") or
-                branch_lower.startswith(protected_lower + "-") or
-                branch_lower.endswith("-" + protected_lower) or
-                branch_lower.endswith("_" + protected_lower) or
-                branch_lower.startswith(protected_lower + "_")):
-                return True
-
-        return False
+        # 精确匹配（O(1)）或前缀/后缀变体（单次正则扫描）
+        return (
+            branch_lower in self._protected_exact
+            or self._protected_re.search(branch_lower) is not None
+        )
 
     def get_protected_branches(self) -> List[str]:
         """
@@ -91,12 +92,47 @@ class ConflictResolver:
         """
         return self.protected_branches.copy()
 
-    def analyze_conflict(self, file_path: str) -> Dict:
+    def _count_markers_only(self, full_path: Path):
+        """
+        只统计冲突标记数量（mmap 快速路径）
+
+        mmap.find 在 C 层完成扫描，不把文件内容复制进 Python 字符串；
+        循环次数只等于标记出现次数
+
+        Args:
+            full_path: 文件完整路径
+
+        Returns:
+            (开始标记数, 分隔标记数, 结束标记数)
+        """
+        def count_marker(mm, needle):
+            n = 0
+            pos = mm.find(needle)
+            while pos != -1:
+                n += 1
+                pos = mm.find(needle, pos + len(needle))
+            return n
+
+        with open(full_path, "rb") as f:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return (
+                        count_marker(mm, b"<<<<<<<"),
+                        count_marker(mm, b"======="),
+                        count_marker(mm, b">>>>>>>"),
+                    )
+            except ValueError:
+                # 空文件无法映射
+                return (0, 0, 0)
+
+    def analyze_conflict(self, file_path: str, details: bool = True) -> Dict:
         """
         分析单个文件的冲突
 
         Args:
             file_path: 冲突文件路径
+            details: 是否生成完整的解决建议；
+                     False 时走 mmap 快速路径，只返回冲突块计数
 
         Returns:
             冲突分析结果
@@ -129,8 +165,38 @@ class ConflictResolver:
                 "suggestion": f"无法检查文件大小: {str(e)}"
             }
 
+        # 只需计数时走 mmap 快速路径，不把内容复制进 Python
+        if not details:
+            try:
+                starts, separators, ends = self._count_markers_only(full_path)
+            except Exception as e:
+                return {
+                    "file": file_path,
+                    "status": "read_error",
+                    "suggestion": f"无法读取文件: {str(e)}"
+                }
+            return {
+                "file": file_path,
+                "status": "conflict",
+                "conflict_blocks": starts,
+                "markers_valid": starts == separators == ends
+            }
+
+        # 单次流式扫描统计冲突标记：
+        # 二进制逐行读取，避免整文件载入内存和 UTF-8 解码开销
+        conflict_start = 0
+        conflict_separator = 0
+        conflict_end = 0
+
         try:
-            content = full_path.read_text(encoding="utf-8", errors="ignore")
+            with open(full_path, "rb") as f:
+                for line in f:
+                    if line.startswith(b"<<<<<<<"):
+                        conflict_start += 1
+                    elif line.startswith(b"======="):
+                        conflict_separator += 1
+                    elif line.startswith(b">>>>>>>"):
+                        conflict_end += 1
         except Exception as e:
             return {
                 "file": file_path,
@@ -138,11 +204,6 @@ class ConflictResolver:
                 "suggestion": f"无法读取文件: {str(e)}"
             }
 
-        # 统计冲突标记
-        conflict_start = content.count("<<<<<<<")
-        conflict_separator = content.count("=======")
-        conflict_end = content.count(">>>>>>>")
-
         # 分析文件类型
         file_ext = Path(file_path).suffix.lower()
         language = self._detect_language(file_ext)
@@ -308,13 +369,13 @@ class ConflictResolver:
                 "summary": "无冲突文件"
             }
 
-        self.conflict_details = []
-        total_blocks = 0
+        # 并发分析冲突文件（I/O 密集：stat + 读取 + 解码），
+        # analyze_conflict 不修改共享状态，无需加锁；map 保证结果顺序
+        max_workers = min(32, len(conflict_files))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            self.conflict_details = list(pool.map(self.analyze_conflict, conflict_files))
 
-        for file_path in conflict_files:
-            detail = self.analyze_conflict(file_path)
-            self.conflict_details.append(detail)
-            total_blocks += detail.get("conflict_blocks", 0)
+        total_blocks = sum(d.get("conflict_blocks", 0) for d in self.conflict_details)
 
         # 生成摘要
         summary_lines = [
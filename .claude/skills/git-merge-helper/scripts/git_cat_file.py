@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Git Merge Helper - 批量对象读取器
+
+功能：
+- 维护一个常驻的 git cat-file --batch 子进程
+- 按引用批量读取 blob 内容，避免每个对象一次 fork+exec
+- 支持 with 语句和线程本地实例复用
+
+用途：
+- 冲突分析时读取合并前的 ours/theirs 版本（:2:<path> / :3:<path>）
+- 未来的三方对比、原始版本展示等功能
+
+Generated: 2026-01-04
+"""
+
+import subprocess
+import threading
+from pathlib import Path
+from typing import Optional
+
+
+class GitCatFile:
+    """git cat-file --batch 常驻进程封装"""
+
+    def __init__(self, cwd: Optional[Path] = None):
+        """
+        初始化批量对象读取器（进程按需启动）
+
+        Args:
+            cwd: 工作目录，默认为当前目录
+        """
+        self.cwd = cwd
+        self._process = None
+        self._check_process = None
+        self._lock = threading.Lock()
+
+    def _ensure_process(self):
+        """确保 cat-file 子进程已启动"""
+        if self._process is not None and self._process.poll() is None:
+            return
+
+        kwargs = {
+            "stdin": subprocess.PIPE,
+            "stdout": subprocess.PIPE,
+            "stderr": subprocess.DEVNULL,
+        }
+        if self.cwd is not None:
+            kwargs["cwd"] = str(self.cwd)
+
+        self._process = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            **kwargs
+        )
+
+    def get(self, ref: str) -> Optional[bytes]:
+        """
+        读取指定引用的对象内容
+
+        Args:
+            ref: 对象引用（如 HEAD:path、:2:path、<sha>）
+
+        Returns:
+            对象内容字节串，对象不存在或读取失败时返回 None
+        """
+        with self._lock:
+            try:
+                self._ensure_process()
+
+                self._process.stdin.write(ref.encode("utf-8") + b"\n")
+                self._process.stdin.flush()
+
+                # 头部格式: "<oid> <type> <size>" 或 "<ref> missing"
+                header = self._process.stdout.readline()
+                if not header:
+                    return None
+
+                parts = header.rstrip(b"\n").split(b" ")
+                if len(parts) < 3 or parts[-1] == b"missing":
+                    return None
+
+                size = int(parts[2])
+                content = self._process.stdout.read(size)
+                # 内容后有一个换行分隔符
+                self._process.stdout.read(1)
+
+                return content
+            except (OSError, ValueError, BrokenPipeError):
+                # 子进程异常退出，关闭后下次调用重启
+                self.close()
+                return None
+
+    def _ensure_check_process(self):
+        """确保 batch-check 子进程已启动"""
+        if self._check_process is not None and self._check_process.poll() is None:
+            return
+
+        kwargs = {
+            "stdin": subprocess.PIPE,
+            "stdout": subprocess.PIPE,
+            "stderr": subprocess.DEVNULL,
+        }
+        if self.cwd is not None:
+            kwargs["cwd"] = str(self.cwd)
+
+        self._check_process = subprocess.Popen(
+            ["git", "cat-file", "--batch-check=%(objectname) %(objecttype)"],
+            **kwargs
+        )
+
+    def check(self, ref: str) -> Optional[str]:
+        """
+        查询对象是否存在（--batch-check，只回头部不传内容）
+
+        走常驻进程，每次查询是一次管道往返，
+        替代逐引用的 git rev-parse / cat-file -e 子进程
+
+        Args:
+            ref: 对象引用（分支名、refs/heads/xxx、<sha> 等）
+
+        Returns:
+            对象的 oid，引用无法解析时返回 None
+        """
+        with self._lock:
+            try:
+                self._ensure_check_process()
+
+                self._check_process.stdin.write(ref.encode("utf-8") + b"\n")
+                self._check_process.stdin.flush()
+
+                # 回复格式: "<oid> <type>" 或 "<ref> missing/ambiguous"
+                reply = self._check_process.stdout.readline()
+                if not reply:
+                    return None
+
+                parts = reply.rstrip(b"\n").split(b" ")
+                if len(parts) != 2 or parts[1] in (b"missing", b"ambiguous"):
+                    return None
+
+                return parts[0].decode("ascii")
+            except (OSError, ValueError, BrokenPipeError):
+                self.close()
+                return None
+
+    @staticmethod
+    def _close_process(process):
+        """关闭单个子进程（吞掉关闭错误）"""
+        try:
+            if process.stdin:
+                process.stdin.close()
+            process.terminate()
+            process.wait(timeout=5)
+        except Exception:
+            pass  # 忽略关闭时的错误
+
+    def close(self):
+        """关闭 cat-file 子进程"""
+        for attr in ("_process", "_check_process"):
+            process = getattr(self, attr)
+            if process is not None:
+                self._close_process(process)
+                setattr(self, attr, None)
+
+    def __enter__(self):
+        """支持 with 语句"""
+        self._ensure_process()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """支持 with 语句"""
+        self.close()
+
+
+# 线程本地实例：每个线程复用一个 cat-file 进程
+_thread_local = threading.local()
+
+
+def get_instance(cwd: Optional[Path] = None) -> GitCatFile:
+    """
+    获取当前线程的 GitCatFile 实例
+
+    Args:
+        cwd: 工作目录（仅首次创建时生效）
+
+    Returns:
+        线程本地的 GitCatFile 实例
+    """
+    instance = getattr(_thread_local, "cat_file", None)
+    if instance is None:
+        instance = GitCatFile(cwd=cwd)
+        _thread_local.cat_file = instance
+    return instance
+
+
+def main():
+    """命令行入口（用于测试）"""
+    print("批量对象读取测试:")
+    print("=" * 50)
+
+    with GitCatFile() as cat_file:
+        content = cat_file.get("HEAD:README.md")
+        if content is not None:
+            print(f"  ✓ HEAD:README.md ({len(content)} 字节)")
+        else:
+            print("  ✗ HEAD:README.md 不存在")
+
+        missing = cat_file.get("HEAD:does-not-exist")
+        print(f"  ✓ 缺失对象返回: {missing}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,10 +11,16 @@ Git Merge Helper - 网络操作辅助类
 Generated: 2026-01-04
 """
 
+import os
+import random
+import re
 import subprocess
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List, Optional, Callable, TYPE_CHECKING
+from functools import lru_cache
+from typing import Dict, List, Optional, Callable, Tuple, TYPE_CHECKING
 from enum import Enum
 
 # 避免循环导入
@@ -32,6 +38,19 @@ class NetworkError(Enum):
     UNKNOWN = "unknown"
 
 
+@lru_cache(maxsize=1)
+def _shared_executor() -> ThreadPoolExecutor:
+    """
+    获取模块级共享线程池（懒初始化，跨调用复用）
+
+    git 子进程是 I/O 密集操作，subprocess 等待期间释放 GIL
+
+    Returns:
+        共享的线程池实例
+    """
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="gmh-net")
+
+
 @dataclass
 class GitOperationResult:
     """Git 操作结果"""
@@ -48,31 +67,45 @@ class GitOperationResult:
 class GitNetworkHelper:
     """Git 网络操作辅助类"""
 
-    # 默认网络错误关键词
-    NETWORK_ERROR_KEYWORDS = [
-        "timeout",
-        "timed out",
-        "connection refused",
-        "could not connect",
-        "host not found",
-        "network unreachable",
-        "unable to access",
-        "ssl error",
-        "certificate",
-        "permission denied",
-        "could not read from remote",
-        # 扩展的错误关键词
-        "dns error",
-        "name resolution failed",
-        "no route to host",
-        "network is unreachable",
-        "ssl",
-        "tls",
-        "handshake",
-        "connection reset",
-        "connection timed out",
-        "temporary failure",
-    ]
+    # 网络错误分类正则：一次 C 层扫描同时完成识别和分类，
+    # 命名分组对应 NetworkError 枚举（替代逐关键词的线性扫描）
+    _NET_RE = re.compile(
+        r"(?P<timeout>connection timed out|timed out|timeout|temporary failure)"
+        r"|(?P<refused>connection refused|connection reset)"
+        r"|(?P<dns>host not found|name resolution failed|no route to host"
+        r"|dns error|network (?:is )?unreachable)"
+        r"|(?P<perm>permission denied)"
+        r"|(?P<other>could not connect|unable to access"
+        r"|could not read from remote|ssl|tls|certificate|handshake)",
+        re.IGNORECASE
+    )
+
+    # 命名分组 -> 错误类型映射
+    _NET_GROUP_MAP = {
+        "timeout": NetworkError.TIMEOUT,
+        "refused": NetworkError.CONNECTION_REFUSED,
+        "dns": NetworkError.HOST_NOT_FOUND,
+        "perm": NetworkError.PERMISSION_DENIED,
+        "other": NetworkError.UNKNOWN,
+    }
+
+    # 指数退避上限（秒）
+    BACKOFF_CAP = 60
+
+    # 熔断阈值：连续网络失败达到该次数后熔断
+    BREAKER_THRESHOLD = 3
+
+    # 熔断持续时间（秒）：期间所有网络操作立即失败
+    BREAKER_COOLDOWN = 30
+
+    # 按操作区分的默认超时（秒）：快速查询尽早失败，批量传输给足时间
+    OP_TIMEOUTS = {
+        "ls-remote": 10,
+        "fetch": 120,
+        "push": 120,
+        "status": 10,
+        "submodule": 30,
+    }
 
     def __init__(self, logger=None, config=None):
         """
@@ -89,10 +122,137 @@ class GitNetworkHelper:
             self.max_retries = config.max_retries
             self.retry_delay = config.retry_delay
             self.network_timeout = config.network_timeout
+            self.ls_remote_cache_ttl = config.ls_remote_cache_ttl
         else:
             self.max_retries = 3
             self.retry_delay = 2
             self.network_timeout = 30
+            self.ls_remote_cache_ttl = 60
+
+        # 按操作的超时表（配置可覆盖）
+        self.op_timeouts = dict(self.OP_TIMEOUTS)
+        if config and getattr(config, "op_timeouts", None):
+            self.op_timeouts.update(config.op_timeouts)
+
+        # 子进程环境：低速连接提前中止（1KB/s 以下持续 30 秒即断开），
+        # 避免僵死的 TCP 连接一直等到整体超时
+        self._git_env = {
+            **os.environ,
+            "GIT_HTTP_LOW_SPEED_LIMIT": "1000",
+            "GIT_HTTP_LOW_SPEED_TIME": "30",
+        }
+
+        # ls-remote 结果缓存：(remote, branch) -> (时间戳, 结果)
+        # OrderedDict 按访问顺序做 LRU 淘汰
+        self._ls_remote_cache = OrderedDict()
+
+        # 熔断器状态：远程持续不可达时避免每次调用都烧满重试预算
+        self._consecutive_failures = 0
+        self._breaker_open_until = 0.0
+
+    def _backoff_delay(self, retries: int) -> float:
+        """
+        计算指数退避延迟（带抖动）
+
+        抖动避免多个进程同步重试造成的重试风暴
+
+        Args:
+            retries: 当前重试次数（从 1 开始）
+
+        Returns:
+            等待秒数
+        """
+        base_delay = min(self.BACKOFF_CAP, self.retry_delay * (2 ** (retries - 1)))
+        return base_delay * random.uniform(0.5, 1.5)
+
+    def _record_network_failure(self):
+        """记录一次网络失败，达到阈值后打开熔断器"""
+        self._consecutive_failures += 1
+        if self._consecutive_failures >= self.BREAKER_THRESHOLD:
+            self._breaker_open_until = time.monotonic() + self.BREAKER_COOLDOWN
+            if self.logger:
+                self.logger.log(
+                    "WARNING",
+                    "网络熔断器已打开",
+                    f"连续失败 {self._consecutive_failures} 次，"
+                    f"{self.BREAKER_COOLDOWN} 秒内网络操作将立即失败"
+                )
+
+    def reset_breaker(self):
+        """手动重置熔断器（用户主动重试时调用）"""
+        self._consecutive_failures = 0
+        self._breaker_open_until = 0.0
+
+    # ls-remote 缓存最大条目数
+    LS_REMOTE_CACHE_SIZE = 100
+
+    def _ls_remote_cache_get(self, remote: str, branch: str) -> Optional[GitOperationResult]:
+        """
+        读取 ls-remote 缓存
+
+        Args:
+            remote: 远程名称
+            branch: 分支名
+
+        Returns:
+            未过期的缓存结果，未命中或已过期返回 None
+        """
+        key = (remote, branch)
+        cached = self._ls_remote_cache.get(key)
+        if cached is None:
+            return None
+
+        timestamp, result = cached
+        if time.monotonic() - timestamp >= self.ls_remote_cache_ttl:
+            del self._ls_remote_cache[key]
+            return None
+
+        # LRU：命中后移到末尾
+        self._ls_remote_cache.move_to_end(key)
+        return result
+
+    def _ls_remote_cache_put(self, remote: str, branch: str, result: GitOperationResult):
+        """
+        写入 ls-remote 缓存（带容量上限淘汰）
+
+        Args:
+            remote: 远程名称
+            branch: 分支名
+            result: 操作结果
+        """
+        key = (remote, branch)
+        self._ls_remote_cache[key] = (time.monotonic(), result)
+        self._ls_remote_cache.move_to_end(key)
+        while len(self._ls_remote_cache) > self.LS_REMOTE_CACHE_SIZE:
+            self._ls_remote_cache.popitem(last=False)
+
+    def _ls_remote_cache_invalidate(self, remote: str, branch: str):
+        """
+        使指定分支的 ls-remote 缓存失效（fetch/push 成功后调用）
+
+        Args:
+            remote: 远程名称
+            branch: 分支名
+        """
+        self._ls_remote_cache.pop((remote, branch), None)
+
+    def _classify_network_error(self, error_output: str) -> Optional[NetworkError]:
+        """
+        网络错误判定与分类（单次扫描）
+
+        IGNORECASE 正则直接扫描原始输出，不做 .lower() 拷贝；
+        判定和分类共用同一次 C 层扫描，多 KB 的 stderr 只读一遍
+
+        Args:
+            error_output: 错误输出（原样传入，无需预处理）
+
+        Returns:
+            错误类型，非网络错误时返回 None
+        """
+        match = self._NET_RE.search(error_output)
+        if match is None:
+            return None
+        return self._NET_GROUP_MAP[match.lastgroup]
 
     def _is_network_error(self, error_output: str) -> bool:
         """
@@ -104,8 +264,7 @@ class GitNetworkHelper:
         Returns:
             是否为网络错误
         """
-        error_lower = error_output.lower()
-        return any(keyword in error_lower for keyword in self.NETWORK_ERROR_KEYWORDS)
+        return self._classify_network_error(error_output) is not None
 
     def _detect_error_type(self, error_output: str) -> NetworkError:
         """
@@ -117,58 +276,106 @@ class GitNetworkHelper:
         Returns:
             错误类型
         """
-        error_lower = error_output.lower()
-
-        if "timeout" in error_lower or "timed out" in error_lower:
-            return NetworkError.TIMEOUT
-        elif "connection refused" in error_lower:
-            return NetworkError.CONNECTION_REFUSED
-        elif "host not found" in error_lower:
-            return NetworkError.HOST_NOT_FOUND
-        elif "permission denied" in error_lower:
-            return NetworkError.PERMISSION_DENIED
-        else:
-            return NetworkError.UNKNOWN
+        return self._classify_network_error(error_output) or NetworkError.UNKNOWN
 
     def run_git_with_retry(
         self,
         args: List[str],
         operation_name: str = "Git 操作",
         timeout: Optional[int] = None,
-        check_remote: bool = False
+        check_remote: bool = False,
+        overall_deadline: Optional[float] = None
     ) -> GitOperationResult:
         """
         执行 Git 命令，支持重试
 
+        整个重试栈受单一墙钟截止时间约束：每次尝试的超时取
+        per-attempt 超时与剩余预算的较小值，预算耗尽立即返回，
+        不再让每次重试都重置超时时钟（最坏等待从
+        (重试数+1)*超时+退避 降为固定上限）
+
         Args:
             args: 命令参数列表
             operation_name: 操作名称（用于日志）
-            timeout: 超时时间（秒）
+            timeout: 单次尝试超时时间（秒）
             check_remote: 是否检查远程连接
+            overall_deadline: 整体截止时间（time.monotonic() 时刻）；
+                              不指定时按超时与重试次数推导
 
         Returns:
             操作结果
         """
         if timeout is None:
-            timeout = self.network_timeout
+            # 未显式指定时按操作类型选择超时
+            op = args[0] if args else ""
+            timeout = self.op_timeouts.get(op, self.network_timeout)
+
+        if overall_deadline is None:
+            # 默认预算：允许每次尝试用满超时，但退避等待计入总预算
+            overall_deadline = time.monotonic() + timeout * (self.max_retries + 1)
 
         command_str = "git " + " ".join(args)
+
+        # 熔断器打开期间立即失败，不再消耗重试预算
+        if time.monotonic() < self._breaker_open_until:
+            return GitOperationResult(
+                success=False,
+                command=command_str,
+                stdout="",
+                stderr="熔断器打开",
+                returncode=-1,
+                retries=0,
+                error_type=NetworkError.UNKNOWN,
+                error_message=f"{operation_name} 失败: 网络熔断器打开，请稍后重试"
+            )
+
         retries = 0
         last_error = None
 
+        # 日志级别门控：WARNING 被丢弃时完全跳过 f-string 格式化；
+        # 重试事件先积攒在本地列表，操作结束时一次性落盘，
+        # 避免重试风暴期间每次尝试都触发日志 I/O
+        log_enabled = (
+            self.logger is not None
+            and getattr(self.logger, "isEnabledFor", lambda level: True)("WARNING")
+        )
+        retry_events = []
+
         while retries <= self.max_retries:
+            # 整体预算耗尽：立即返回，跳过注定超出截止时间的尝试
+            remaining = overall_deadline - time.monotonic()
+            if remaining <= 0:
+                self._record_network_failure()
+                return GitOperationResult(
+                    success=False,
+                    command=command_str,
+                    stdout="",
+                    stderr="整体截止时间已到",
+                    returncode=-1,
+                    retries=retries,
+                    error_type=NetworkError.TIMEOUT,
+                    error_message=f"{operation_name} 超出整体时间预算，已尝试 {retries} 次"
+                )
+
             try:
-                # 执行命令
+                # 执行命令（单次超时不超过剩余预算）。
+                # close_fds=False：本模块不持有非 CLOEXEC 的文件描述符
+                # （PEP 446 后 Python 打开的 fd 默认 CLOEXEC），关闭循环
+                # 纯属浪费；且不设 preexec_fn/shell/pass_fds，让 CPython
+                # 走 posix_spawn 快速路径，省去 fork 的页表复制
                 process = subprocess.run(
                     ["git"] + args,
                     capture_output=True,
                     text=True,
                     check=False,
-                    timeout=timeout
+                    timeout=min(timeout, remaining),
+                    env=self._git_env,
+                    close_fds=False
                 )
 
                 # 成功
                 if process.returncode == 0:
+                    self._consecutive_failures = 0
                     result = GitOperationResult(
                         success=True,
                         command=command_str,
@@ -179,35 +386,39 @@ class GitNetworkHelper:
                     )
 
                     if retries > 0 and self.logger:
+                        # 重试后成功：聚合为一条 INFO，不再回放每次重试
                         self.logger.log(
                             "INFO",
                             f"{operation_name} 重试成功",
                             f"第 {retries + 1} 次尝试成功"
+                            f"（经历 {len(retry_events)} 次重试等待）"
                         )
 
                     return result
 
-                # 失败，检查是否为网络错误
+                # 失败，检查是否为网络错误（判定与分类同一次扫描）
                 error_output = process.stderr + process.stdout
+                error_kind = self._classify_network_error(error_output)
 
-                if self._is_network_error(error_output):
-                    last_error = self._detect_error_type(error_output)
+                if error_kind is not None:
+                    last_error = error_kind
 
                     if retries < self.max_retries:
                         retries += 1
-                        wait_time = self.retry_delay * retries  # 递增延迟
+                        wait_time = self._backoff_delay(retries)  # 指数退避 + 抖动
 
-                        if self.logger:
-                            self.logger.log(
-                                "WARNING",
-                                f"{operation_name} 失败，{wait_time}秒后重试",
+                        if log_enabled:
+                            retry_events.append((
+                                f"{operation_name} 失败，{wait_time:.1f}秒后重试",
                                 f"尝试 {retries + 1}/{self.max_retries + 1}: {last_error.value}"
-                            )
+                            ))
 
                         time.sleep(wait_time)
                         continue
                     else:
                         # 达到最大重试次数
+                        self._flush_retry_events(retry_events)
+                        self._record_network_failure()
                         error_message = self._format_error_message(operation_name, last_error, error_output)
                         return GitOperationResult(
                             success=False,
@@ -237,18 +448,19 @@ class GitNetworkHelper:
 
                 if retries < self.max_retries:
                     retries += 1
-                    wait_time = self.retry_delay * retries
+                    wait_time = self._backoff_delay(retries)
 
-                    if self.logger:
-                        self.logger.log(
-                            "WARNING",
-                            f"{operation_name} 超时，{wait_time}秒后重试",
+                    if log_enabled:
+                        retry_events.append((
+                            f"{operation_name} 超时，{wait_time:.1f}秒后重试",
                             f"尝试 {retries + 1}/{self.max_retries + 1}"
-                        )
+                        ))
 
                     time.sleep(wait_time)
                     continue
                 else:
+                    self._flush_retry_events(retry_events)
+                    self._record_network_failure()
                     error_message = f"{operation_name} 超时（{timeout}秒），已重试 {self.max_retries} 次"
                     return GitOperationResult(
                         success=False,
@@ -286,6 +498,26 @@ class GitNetworkHelper:
             error_message="未知错误"
         )
 
+    def _flush_retry_events(self, events: List[Tuple[str, str]]):
+        """
+        一次性输出积攒的重试事件
+
+        日志器支持 log_batch 时整批传递（单次 I/O），
+        否则逐条回退输出
+
+        Args:
+            events: (标题, 详情) 元组列表
+        """
+        if not self.logger or not events:
+            return
+
+        log_batch = getattr(self.logger, "log_batch", None)
+        if log_batch is not None:
+            log_batch("WARNING", events)
+        else:
+            for title, message in events:
+                self.logger.log("WARNING", title, message)
+
     def _format_error_message(self, operation: str, error_type: NetworkError, details: str) -> str:
         """
         格式化错误消息
@@ -313,7 +545,8 @@ class GitNetworkHelper:
         self,
         branch: str,
         remote: str = "origin",
-        timeout: Optional[int] = None
+        timeout: Optional[int] = None,
+        prefer_local: bool = True
     ) -> GitOperationResult:
         """
         检查远程分支是否存在
@@ -322,17 +555,105 @@ class GitNetworkHelper:
             branch: 分支名
             remote: 远程名称
             timeout: 超时时间
+            prefer_local: 是否优先查本地远程跟踪引用（毫秒级，无网络）；
+                          本地没有该引用时仍回退到 ls-remote。
+                          注意：远程新建但尚未 fetch 的分支本地查不到，
+                          需要权威结果时传 False
 
         Returns:
             操作结果
+
+        Note:
+            网络查询结果带 TTL 缓存（默认 60 秒），重复查询同一分支
+            不会重复发起网络请求；fetch/push 成功后缓存自动失效
         """
-        return self.run_git_with_retry(
+        # 快速路径：本地远程跟踪引用存在即可确认分支存在
+        if prefer_local:
+            try:
+                local = subprocess.run(
+                    ["git", "show-ref", "--verify", "--quiet",
+                     f"refs/remotes/{remote}/{branch}"],
+                    capture_output=True,
+                    text=True,
+                    check=False,
+                    timeout=2,
+                    close_fds=False
+                )
+                if local.returncode == 0:
+                    return GitOperationResult(
+                        success=True,
+                        command=f"git show-ref --verify refs/remotes/{remote}/{branch}",
+                        stdout=local.stdout,
+                        stderr=local.stderr,
+                        returncode=0,
+                        retries=0
+                    )
+            except (subprocess.TimeoutExpired, OSError):
+                # 本地查询异常，继续走网络路径
+                pass
+
+        cached = self._ls_remote_cache_get(remote, branch)
+        if cached is not None:
+            return cached
+
+        result = self.run_git_with_retry(
             ["ls-remote", "--heads", remote, branch],
             operation_name=f"检查远程分支 {remote}/{branch}",
             timeout=timeout,
             check_remote=True
         )
 
+        self._ls_remote_cache_put(remote, branch, result)
+        return result
+
+    def check_remote_branches(
+        self,
+        specs: List[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], GitOperationResult]:
+        """
+        并发检查多个远程分支是否存在
+
+        各分支的网络往返并行进行，总耗时从各 RTT 之和降为最大 RTT
+
+        Args:
+            specs: (分支名, 远程名称) 元组列表
+
+        Returns:
+            {(分支名, 远程名称): 操作结果} 字典
+        """
+        if not specs:
+            return {}
+
+        executor = _shared_executor()
+        futures = {
+            spec: executor.submit(self.check_remote_branch, spec[0], spec[1])
+            for spec in specs
+        }
+        return {spec: future.result() for spec, future in futures.items()}
+
+    def fetch_branches(
+        self,
+        specs: List[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], GitOperationResult]:
+        """
+        并发拉取多个远程分支
+
+        Args:
+            specs: (分支名, 远程名称) 元组列表
+
+        Returns:
+            {(分支名, 远程名称): 操作结果} 字典
+        """
+        if not specs:
+            return {}
+
+        executor = _shared_executor()
+        futures = {
+            spec: executor.submit(self.fetch_branch, spec[0], spec[1])
+            for spec in specs
+        }
+        return {spec: future.result() for spec, future in futures.items()}
+
     def fetch_branch(
         self,
         branch: str,
@@ -350,13 +671,19 @@ class GitNetworkHelper:
         Returns:
             操作结果
         """
-        return self.run_git_with_retry(
+        result = self.run_git_with_retry(
             ["fetch", remote, branch],
             operation_name=f"拉取远程分支 {remote}/{branch}",
             timeout=timeout,
             check_remote=True
         )
 
+        # 拉取成功后远程状态已更新，对应缓存失效
+        if result.success:
+            self._ls_remote_cache_invalidate(remote, branch)
+
+        return result
+
     def push_branch(
         self,
         branch: str,
@@ -380,13 +707,19 @@ class GitNetworkHelper:
         if force:
             args.append("--force")
 
-        return self.run_git_with_retry(
+        result = self.run_git_with_retry(
             args,
             operation_name=f"推送分支 {remote}/{branch}",
             timeout=timeout,
             check_remote=True
         )
 
+        # 推送成功后远程状态已更新，对应缓存失效
+        if result.success:
+            self._ls_remote_cache_invalidate(remote, branch)
+
+        return result
+
 
 def main():
     """命令行入口（用于测试）"""
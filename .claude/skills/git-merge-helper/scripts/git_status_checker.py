@@ -10,12 +10,22 @@ Git Merge Helper - Git 状态检查器
 Generated: 2026-01-04
 """
 
+import json
 import os
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import List, Optional
 from enum import Enum
 
+# 可选依赖：pygit2 通过 libgit2 读取仓库状态，
+# 完全不 fork git 子进程（单次查询从 ~10ms 降到微秒级）
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
 
 class StatusCode(Enum):
     """状态码"""
@@ -36,6 +46,36 @@ class StatusItem:
     description: str
 
 
+# 单个状态位的中文描述
+_STATUS_DESCRIPTIONS = {
+    "M": "已修改",
+    "A": "已添加到暂存区",
+    "D": "已删除",
+    "R": "已重命名",
+    "C": "已复制",
+    "U": "已更新但未合并",
+}
+
+
+def _build_desc(staged: str, unstaged: str) -> str:
+    """拼接 (暂存位, 工作区位) 的完整描述"""
+    desc = []
+    if staged in _STATUS_DESCRIPTIONS:
+        desc.append(f"暂存: {_STATUS_DESCRIPTIONS[staged]}")
+    if unstaged in _STATUS_DESCRIPTIONS:
+        desc.append(f"工作区: {_STATUS_DESCRIPTIONS[unstaged]}")
+    return " | ".join(desc) if desc else "未知状态"
+
+
+# 模块导入时展开全部常见组合，_get_status_description 退化为一次查表，
+# 不再每行变更都重建字典并做字符串拼接
+_DESC_TABLE = {
+    staged + unstaged: _build_desc(staged, unstaged)
+    for staged in "MADRCU?! "
+    for unstaged in "MADRCU?! "
+}
+
+
 class GitStatusChecker:
     """Git 状态检查器"""
 
@@ -51,19 +91,117 @@ class GitStatusChecker:
         "!!": StatusCode.DIRTY,         # 已忽略
     }
 
-    def __init__(self, project_root: Optional[str] = None):
+    # 默认忽略的路径：以 / 结尾表示整个目录，否则按文件名任意层级匹配
+    DEFAULT_EXCLUDES = [".DS_Store", ".claude/"]
+
+    # 透传到子进程的认证/代理环境变量：
+    # lfs locks 等网络调用依赖 ssh-agent / 凭据助手 / 代理配置
+    _ENV_PASSTHROUGH = (
+        "SSH_AUTH_SOCK", "SSH_AGENT_PID", "GIT_SSH", "GIT_SSH_COMMAND",
+        "GIT_ASKPASS", "SSH_ASKPASS",
+        "http_proxy", "https_proxy", "all_proxy", "no_proxy",
+        "HTTP_PROXY", "HTTPS_PROXY", "ALL_PROXY", "NO_PROXY",
+    )
+
+    # LFS 锁定状态缓存时间（秒）
+    LFS_LOCKS_CACHE_TTL = 60
+
+    # 界面不可见时 check_repository_cached 的最小缓存时间（秒）
+    HIDDEN_MAX_AGE = 60.0
+
+    def __init__(self, project_root: Optional[str] = None,
+                 exclude: Optional[List[str]] = None):
         """
         初始化状态检查器
 
         Args:
             project_root: 项目根目录
+            exclude: 忽略的路径模式列表，默认为 DEFAULT_EXCLUDES
         """
         self.project_root = project_root or os.getcwd()
+        self.exclude = list(exclude) if exclude is not None else list(self.DEFAULT_EXCLUDES)
+
+        # 转成 :(exclude) pathspec，过滤下沉到 git 内部完成：
+        # 被忽略的条目根本不会出现在输出里，Python 侧无需再二次过滤
+        self._exclude_pathspecs = [
+            self._to_exclude_pathspec(pattern) for pattern in self.exclude
+        ]
+
+        # 精简的子进程环境：LC_ALL=C 让 git 启动时跳过 gettext 翻译
+        # 文件加载；GIT_OPTIONAL_LOCKS=0 使只读操作不争抢 index.lock；
+        # GIT_TERMINAL_PROMPT=0 保证凭据缺失时立即失败而不是挂起。
+        # 所有子进程共用同一个字典，省去每次调用的 environ 拷贝
+        self._env = {
+            "PATH": os.environ.get("PATH", ""),
+            "HOME": os.environ.get("HOME", ""),
+            "LC_ALL": "C",
+            "LANG": "C",
+            "GIT_OPTIONAL_LOCKS": "0",
+            "GIT_TERMINAL_PROMPT": "0",
+        }
+        # 认证/代理变量必须透传：git lfs locks 要访问 LFS 服务器，
+        # 丢掉 ssh-agent 套接字或代理设置后该调用在
+        # GIT_TERMINAL_PROMPT=0 下直接认证失败，被误判成"无锁定"
+        for key in self._ENV_PASSTHROUGH:
+            value = os.environ.get(key)
+            if value is not None:
+                self._env[key] = value
+
+        # 高频命令的完整 argv 预先构建一次（含 "git" 前缀），
+        # 每次检查不再重新拼接列表。porcelain=v2 在同一份输出里
+        # 携带 submodule 状态列，免去单独的 git submodule status 调用
+        self._status_cmd = (
+            "git", "status", "--porcelain=v2", "--branch",
+            "--untracked-files=normal", "-z", "--", ".",
+            *self._exclude_pathspecs
+        )
 
-    def check_repository(self) -> dict:
+        # LFS 锁定状态缓存（带 TTL）
+        self._lfs_locked_cache: Optional[bool] = None
+        self._lfs_locked_cache_time = 0.0
+
+        # check_repository 结果缓存（供 check_repository_cached 使用）
+        self._status_cache: Optional[dict] = None
+        self._status_cache_time = 0.0
+        self._visible = True
+
+        # 探测前置条件的惰性记忆（绝大多数仓库没有 submodule/LFS，
+        # 一次 stat 即可免去对应探测的整个 fork/exec）
+        self._has_submodules_memo: Optional[bool] = None
+        self._lfs_possible_memo: Optional[bool] = None
+
+        # assume-unchanged 位只随 index 变化，按 .git/index 的 mtime 缓存
+        self._assume_unchanged_cache: Optional[bool] = None
+        self._assume_index_mtime = None
+
+    @staticmethod
+    def _to_exclude_pathspec(pattern: str) -> str:
+        """
+        把忽略模式转换为 git 的排除 pathspec
+
+        Args:
+            pattern: 忽略模式（目录以 / 结尾）
+
+        Returns:
+            :(exclude) 形式的 pathspec
+        """
+        if pattern.endswith("/"):
+            # 目录：排除该目录及其下所有内容
+            return f":(exclude){pattern.rstrip('/')}"
+        # 文件名：任意层级匹配
+        return f":(glob,exclude)**/{pattern}"
+
+    def check_repository(self, only_is_clean: bool = False,
+                         probe_specials: bool = True) -> dict:
         """
         检查 Git 仓库状态
 
+        Args:
+            only_is_clean: 只需要干净与否的结论时走快速路径，
+                           不逐行构造 StatusItem（items 为空列表）
+            probe_specials: 是否探测 LFS 锁和 assume-unchanged
+                            （关闭后整个检查只有一次 git status 子进程）
+
         Returns:
             状态字典
         """
@@ -81,31 +219,121 @@ class GitStatusChecker:
             "warnings": []
         }
 
-        # 检查基本状态
-        git_status = self._run_git(["status", "--porcelain"])
+        # 特殊状态探测与 git status 相互独立，提前并发提交；
+        # 子进程等待期间释放 GIL，串行 fork 变为并行。
+        # 仓库未声明 LFS 时对应探测直接跳过（一次 stat 的成本）；
+        # submodule 状态从 porcelain=v2 输出内联解析，无需单独探测
+        if probe_specials:
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                lfs_future = (
+                    pool.submit(self._check_lfs_locked)
+                    if self._may_use_lfs() else None
+                )
+                assume_future = pool.submit(self._check_assume_unchanged)
+
+                # 检查基本状态：-z 以 NUL 分隔且不做引号转义，
+                # 字节流解析免去整块 stdout 的解码和 strip/split 开销；
+                # 忽略规则通过排除 pathspec 直接交给 git 过滤
+                git_status = self._run_git(self._status_cmd, text=False)
+        else:
+            lfs_future = assume_future = None
+            git_status = self._run_git(self._status_cmd, text=False)
+
         if not git_status["success"]:
             result["errors"].append("无法获取 Git 状态")
             result["is_clean"] = False
             return result
 
-        # 解析状态输出
-        lines = git_status["stdout"].strip().split("\n") if git_status["stdout"] else []
-        for line in lines:
-            if not line.strip():
+        # 收集特殊状态探测结果（with 块退出时已全部完成）
+        result["has_lfs_locked"] = (
+            lfs_future.result() if lfs_future is not None else False
+        )
+        result["has_assume_unchanged"] = (
+            assume_future.result() if assume_future is not None else False
+        )
+
+        entries = (git_status["stdout"] or b"").split(b"\x00")
+
+        # 快速路径：只要干净与否的结论时不构造 StatusItem，
+        # 有任一非表头条目（忽略规则已由 git 过滤）即为不干净；
+        # submodule 变更必然伴随状态条目，无需单独判断
+        if only_is_clean:
+            has_dirty_entry = any(
+                len(entry) >= 3 and not entry.startswith(b"#")
+                for entry in entries
+            )
+
+            result["is_clean"] = (
+                not has_dirty_entry
+                and not result["has_lfs_locked"]
+                and not result["has_assume_unchanged"]
+            )
+            result["has_changes"] = not result["is_clean"]
+            return result
+
+        # 解析 porcelain=v2 输出（循环外取局部别名，省去每行的属性查找）
+        # 条目格式（NUL 分隔）：
+        #   # <header>      表头（--branch）
+        #   ? <path>        未跟踪   / ! <path> 已忽略
+        #   1 <XY> <sub> ... <path>              普通变更
+        #   2 <XY> <sub> ... <path> NUL <orig>   重命名/复制
+        #   u <XY> <sub> ... <path>              未合并
+        # <sub> 列为 S 开头时表示 submodule，后三位非 . 即有状态变化
+        status_map_get = self.STATUS_MAP.get
+        items = result["items"]
+        submodule_changed = False
+        index = 0
+        total = len(entries)
+        while index < total:
+            entry = entries[index]
+            index += 1
+            if len(entry) < 3:
+                continue
+
+            kind = entry[:1]
+            if kind == b"#":
                 continue
 
-            # 解析状态代码
-            status_code = line[:2]
-            file_path = line[3:]
-            status_type = self.STATUS_MAP.get(status_code[0], StatusCode.DIRTY)
+            if kind == b"?" or kind == b"!":
+                status_code = (kind + kind).decode("ascii")
+                file_path = entry[2:].decode("utf-8", errors="replace")
+            elif kind == b"1":
+                fields = entry.split(b" ", 8)
+                if len(fields) < 9:
+                    continue
+                status_code = fields[1].replace(b".", b" ").decode("ascii", errors="replace")
+                file_path = fields[8].decode("utf-8", errors="replace")
+                if fields[2][:1] == b"S" and fields[2][1:].strip(b"."):
+                    submodule_changed = True
+            elif kind == b"2":
+                fields = entry.split(b" ", 9)
+                if len(fields) < 10:
+                    continue
+                status_code = fields[1].replace(b".", b" ").decode("ascii", errors="replace")
+                file_path = fields[9].decode("utf-8", errors="replace")
+                if fields[2][:1] == b"S" and fields[2][1:].strip(b"."):
+                    submodule_changed = True
+                # 重命名/复制条目后跟一个 NUL 分隔的源路径，跳过
+                if index < total:
+                    index += 1
+            elif kind == b"u":
+                fields = entry.split(b" ", 10)
+                if len(fields) < 11:
+                    continue
+                status_code = fields[1].decode("ascii", errors="replace")
+                file_path = fields[10].decode("utf-8", errors="replace")
+                if fields[2][:1] == b"S" and fields[2][1:].strip(b"."):
+                    submodule_changed = True
+            else:
+                continue
 
             item = StatusItem(
                 file=file_path,
                 status_code=status_code,
-                status_type=status_type,
+                status_type=status_map_get(status_code[0], StatusCode.DIRTY),
                 description=self._get_status_description(status_code)
             )
-            result["items"].append(item)
+            items.append(item)
 
             # 更新标志
             if status_code[0] != "!" and status_code[0] != "?":
@@ -116,20 +344,11 @@ class GitStatusChecker:
             if status_code[0] == "?" or status_code[0] == "!":
                 result["has_untracked"] = True
 
-        # 检查特殊状态
-        result["has_submodule_changes"] = self._check_submodule_changes()
-        result["has_lfs_locked"] = self._check_lfs_locked()
-        result["has_assume_unchanged"] = self._check_assume_unchanged()
-
-        # 判断是否干净
-        # 忽略 .DS_Store 和 .claude 目录
-        filtered_items = [
-            item for item in result["items"]
-            if ".DS_Store" not in item.file and ".claude/" not in item.file
-        ]
+        result["has_submodule_changes"] = submodule_changed
 
+        # 判断是否干净（被忽略的路径已由排除 pathspec 过滤，不在 items 中）
         result["is_clean"] = (
-            len(filtered_items) == 0
+            len(result["items"]) == 0
             and not result["has_submodule_changes"]
             and not result["has_lfs_locked"]
             and not result["has_assume_unchanged"]
@@ -138,47 +357,212 @@ class GitStatusChecker:
 
         return result
 
-    def _check_submodule_changes(self) -> bool:
-        """检查是否有 submodule 变更"""
-        result = self._run_git(["submodule", "status"])
-        if not result["success"]:
+    def check_repository_fast(self) -> dict:
+        """
+        快速检查：整个调用只有一次 git status 子进程
+
+        跳过 LFS 锁和 assume-unchanged 探针（各自一个子进程），
+        submodule 状态仍从 porcelain=v2 输出内联解析。
+        返回与 check_repository 相同形状的字典，
+        适合只关心工作区变更的调用方
+
+        Returns:
+            状态字典
+        """
+        return self.check_repository(probe_specials=False)
+
+    def check_repository_cached(self, max_age: float = 5.0) -> dict:
+        """
+        检查 Git 仓库状态（带时效缓存）
+
+        连续的重复调用（如界面刷新）在 max_age 秒内只触发一次
+        真实检查，其余直接返回上次的结果字典。已知会改变仓库状态
+        的操作（合并、切换分支等）之后应调用 invalidate()。
+
+        Args:
+            max_age: 缓存最大有效时间（秒）；界面不可见时
+                     自动放宽到 HIDDEN_MAX_AGE
+
+        Returns:
+            状态字典（可能是缓存副本）
+        """
+        if not self._visible:
+            max_age = max(max_age, self.HIDDEN_MAX_AGE)
+
+        now = time.monotonic()
+        if (self._status_cache is not None
+                and now - self._status_cache_time < max_age):
+            return self._status_cache
+
+        result = self.check_repository()
+        self._status_cache = result
+        self._status_cache_time = time.monotonic()
+        return result
+
+    def invalidate(self):
+        """使缓存失效（在 merge/checkout 等已知变更操作后调用）"""
+        self._status_cache = None
+        self._lfs_locked_cache = None
+        self._has_submodules_memo = None
+        self._lfs_possible_memo = None
+        self._assume_unchanged_cache = None
+
+    def set_visible(self, visible: bool):
+        """
+        设置界面可见性
+
+        不可见时 check_repository_cached 的缓存时间放宽到
+        HIDDEN_MAX_AGE，后台刷新不再频繁启动 git 子进程
+
+        Args:
+            visible: 界面是否可见
+        """
+        self._visible = bool(visible)
+
+    def _stream_git_match(self, args: list, match) -> bool:
+        """
+        流式读取 git 输出，检查是否有行满足条件
+
+        capture_output 会把整个 stdout 读进内存再解码（大仓库的
+        ls-files -v 可达数 MB）；这里逐行读取，命中第一行即终止
+        子进程返回，峰值内存从 O(输出大小) 降到 O(1)。
+
+        Args:
+            args: git 命令参数
+            match: 行匹配函数
+
+        Returns:
+            True 如果有行满足条件
+        """
+        try:
+            proc = subprocess.Popen(
+                ["git"] + args,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                cwd=self.project_root,
+                env=self._env,
+                close_fds=False
+            )
+        except Exception:
             return False
 
-        # 检查是否有变更
-        for line in result["stdout"].split("\n"):
-            if any(word in line for word in ["+", "-", "U", "M"]):
-                return True
-        return False
+        found = False
+        try:
+            for line in proc.stdout:
+                if match(line):
+                    found = True
+                    break
+        finally:
+            proc.stdout.close()
+            if found:
+                # 提前命中：不再等 git 产出剩余内容
+                proc.terminate()
+            proc.wait()
+
+        return found
+
+    def _has_submodules(self) -> bool:
+        """仓库是否声明了 submodule（.gitmodules 存在与否，结果记忆）"""
+        if self._has_submodules_memo is None:
+            self._has_submodules_memo = os.path.isfile(
+                os.path.join(self.project_root, ".gitmodules")
+            )
+        return self._has_submodules_memo
+
+    def _may_use_lfs(self) -> bool:
+        """仓库是否可能启用了 LFS（根 .gitattributes 声明 filter=lfs）"""
+        if self._lfs_possible_memo is None:
+            attributes_path = os.path.join(self.project_root, ".gitattributes")
+            possible = False
+            if os.path.isfile(attributes_path):
+                try:
+                    with open(attributes_path, encoding="utf-8", errors="ignore") as f:
+                        possible = "filter=lfs" in f.read()
+                except OSError:
+                    possible = False
+            self._lfs_possible_memo = possible
+        return self._lfs_possible_memo
+
+    # submodule status 的状态前缀：+ 提交不一致、- 未初始化、U 有冲突
+    _SUBMODULE_MARKERS = frozenset("+-U")
+
+    def _check_submodule_changes(self) -> bool:
+        """
+        检查是否有 submodule 变更
+
+        git submodule status 的状态字符固定在第 0 列，只测行首前缀；
+        旧实现对整行做子串扫描，路径里带 - 或 U 会误报
+        """
+        markers = self._SUBMODULE_MARKERS
+        return self._stream_git_match(
+            ["submodule", "status", "--recursive"],
+            lambda line: line[:1] in markers
+        )
 
     def _check_lfs_locked(self) -> bool:
-        """检查是否有 LFS 锁定文件"""
-        result = self._run_git(["lfs", "status"], check=False)
-        if not result["success"]:
-            return False
+        """
+        检查是否有 LFS 锁定文件
 
-        # 检查是否有锁定文件
-        for line in result["stdout"].split("\n"):
-            if "locked" in line.lower():
-                return True
-        return False
+        使用 git lfs locks --json：结构化输出直接反映锁定列表，
+        不再对 git lfs status 的全量文本做逐行子串匹配。
+        结果缓存 LFS_LOCKS_CACHE_TTL 秒——锁定状态变化频率远低于
+        状态检查频率，重复检查时省掉一次 lfs 子进程
+        """
+        now = time.monotonic()
+        if (self._lfs_locked_cache is not None
+                and now - self._lfs_locked_cache_time < self.LFS_LOCKS_CACHE_TTL):
+            return self._lfs_locked_cache
 
-    def _check_assume_unchanged(self) -> bool:
-        """检查是否有 assume-unchanged 文件"""
-        result = self._run_git(["ls-files", "-v"])
+        result = self._run_git(["lfs", "locks", "--json"], check=False)
         if not result["success"]:
-            return False
+            # lfs 未安装或仓库未启用 LFS
+            locked = False
+        else:
+            try:
+                locks = json.loads(result["stdout"] or "[]")
+            except json.JSONDecodeError:
+                locks = []
+            locked = bool(locks)
+
+        self._lfs_locked_cache = locked
+        self._lfs_locked_cache_time = now
+        return locked
 
-        # git ls-files -v 输出格式：
-        # 小写 h = assume-unchanged (被标记为假设未变更)
-        # 大写 H = 正常文件
-        for line in result["stdout"].split("\n"):
-            if line.startswith("h "):  # 只检测小写 h
-                return True
-        return False
+    def _check_assume_unchanged(self) -> bool:
+        """
+        检查是否有 assume-unchanged 文件
+
+        git ls-files -v 输出格式：
+        小写 h = assume-unchanged (被标记为假设未变更)
+        大写 H = 正常文件
+
+        assume-unchanged 位存储在 index 中，index 的 mtime 未变化时
+        直接返回上次结果，不再扫描整个文件列表
+        """
+        index_path = os.path.join(self.project_root, ".git", "index")
+        try:
+            index_mtime = os.stat(index_path).st_mtime_ns
+        except OSError:
+            index_mtime = None
+
+        if (index_mtime is not None
+                and self._assume_unchanged_cache is not None
+                and index_mtime == self._assume_index_mtime):
+            return self._assume_unchanged_cache
+
+        found = self._stream_git_match(
+            ["ls-files", "-v"],
+            lambda line: line.startswith("h ")  # 只检测小写 h
+        )
+
+        self._assume_unchanged_cache = found
+        self._assume_index_mtime = index_mtime
+        return found
 
     def _get_status_description(self, status_code: str) -> str:
         """
-        获取状态描述
+        获取状态描述（查预构建的描述表）
 
         Args:
             status_code: Git 状态代码
@@ -186,46 +570,138 @@ class GitStatusChecker:
         Returns:
             状态描述
         """
-        descriptions = {
-            "M": "已修改",
-            "A": "已添加到暂存区",
-            "D": "已删除",
-            "R": "已重命名",
-            "C": "已复制",
-            "U": "已更新但未合并",
-            "??": "未跟踪",
-            "!!": "已忽略"
-        }
-
-        staged = status_code[0]
+        staged = status_code[0] if status_code else " "
         unstaged = status_code[1] if len(status_code) > 1 else " "
 
-        desc = []
-        if staged in descriptions:
-            desc.append(f"暂存: {descriptions[staged]}")
-        if unstaged in descriptions:
-            desc.append(f"工作区: {descriptions[unstaged]}")
+        key = staged + unstaged
+        desc = _DESC_TABLE.get(key)
+        if desc is None:
+            # 表未覆盖的罕见状态位：按需构建并记入表中
+            desc = _build_desc(staged, unstaged)
+            _DESC_TABLE[key] = desc
+        return desc
+
+    def _is_excluded(self, path: str) -> bool:
+        """判断路径是否命中忽略模式（pygit2 路径不走 pathspec，需在此过滤）"""
+        for pattern in self.exclude:
+            if pattern.endswith("/"):
+                if path.startswith(pattern) or f"/{pattern}" in path:
+                    return True
+            elif path == pattern or path.endswith(f"/{pattern}"):
+                return True
+        return False
+
+    def _status_via_pygit2(self, v2: bool = False) -> Optional[bytes]:
+        """
+        通过 pygit2 获取仓库状态，输出与 git status --porcelain -z 等价
+
+        libgit2 在进程内直接读 index 和工作区，省掉 fork+exec+git 启动。
+        任何异常都返回 None，由调用方回退到 git 子进程。
 
-        return " | ".join(desc) if desc else "未知状态"
+        Args:
+            v2: 输出 porcelain=v2 条目格式（submodule 列固定为 N...）
 
-    def _run_git(self, args: list, check: bool = True) -> dict:
+        Returns:
+            NUL 分隔的状态字节流，失败时返回 None
+        """
+        try:
+            repo = pygit2.Repository(self.project_root)
+            status = repo.status(untracked_files="normal", ignored=False)
+
+            entries = []
+            for path, flags in status.items():
+                if self._is_excluded(path):
+                    continue
+
+                if flags & pygit2.GIT_STATUS_CONFLICTED:
+                    code = "UU"
+                elif flags & pygit2.GIT_STATUS_WT_NEW:
+                    code = "??"
+                else:
+                    if flags & pygit2.GIT_STATUS_INDEX_NEW:
+                        staged = "A"
+                    elif flags & pygit2.GIT_STATUS_INDEX_MODIFIED:
+                        staged = "M"
+                    elif flags & pygit2.GIT_STATUS_INDEX_DELETED:
+                        staged = "D"
+                    elif flags & pygit2.GIT_STATUS_INDEX_RENAMED:
+                        staged = "R"
+                    else:
+                        staged = " "
+
+                    if flags & pygit2.GIT_STATUS_WT_MODIFIED:
+                        unstaged = "M"
+                    elif flags & pygit2.GIT_STATUS_WT_DELETED:
+                        unstaged = "D"
+                    else:
+                        unstaged = " "
+
+                    code = staged + unstaged
+
+                if v2:
+                    if code == "??" or code == "!!":
+                        entries.append(f"{code[0]} {path}".encode("utf-8"))
+                    elif code == "UU":
+                        # u 条目的中间字段解析时不使用，填占位值
+                        entries.append(
+                            f"u UU N... 0 0 0 0 0 0 0 {path}".encode("utf-8")
+                        )
+                    else:
+                        xy = code.replace(" ", ".")
+                        entries.append(
+                            f"1 {xy} N... 0 0 0 0 0 {path}".encode("utf-8")
+                        )
+                else:
+                    entries.append(f"{code} {path}".encode("utf-8"))
+
+            if not entries:
+                return b""
+            return b"\x00".join(entries) + b"\x00"
+        except Exception:
+            # 仓库打开失败、裸仓库、libgit2 版本差异等，一律回退子进程
+            return None
+
+    def _run_git(self, args: list, check: bool = True, text: bool = True) -> dict:
         """
         运行 Git 命令
 
+        pygit2 可用时，status 查询走进程内的 libgit2 快速路径，
+        不 fork 子进程；其余命令（或快速路径失败时）仍走 subprocess。
+
         Args:
-            args: 命令参数
+            args: 命令参数（可带 "git" 前缀，预构建的完整 argv 直接复用）
             check: 是否检查返回码
+            text: 是否按文本解码输出（False 时 stdout/stderr 为字节）
 
         Returns:
             结果字典
         """
+        cmd = args if args and args[0] == "git" else ("git", *args)
+
+        if (pygit2 is not None and len(cmd) > 1 and cmd[1] == "status"
+                and ("--porcelain=v1" in cmd or "--porcelain=v2" in cmd)):
+            stdout = self._status_via_pygit2(v2="--porcelain=v2" in cmd)
+            if stdout is not None:
+                return {
+                    "success": True,
+                    "stdout": stdout.decode("utf-8", errors="replace") if text else stdout,
+                    "stderr": "" if text else b"",
+                    "returncode": 0
+                }
+
         try:
+            # close_fds=False：本模块不持有非 CLOEXEC 描述符（PEP 446 后
+            # Python 打开的 fd 默认 CLOEXEC），跳过子进程里 O(ulimit) 的
+            # fd 关闭循环；不设 preexec_fn/shell/pass_fds，保持子进程
+            # 创建走 CPython 的 posix_spawn 快速路径
             process = subprocess.run(
-                ["git"] + args,
+                cmd,
                 capture_output=True,
-                text=True,
+                text=text,
                 check=check,
-                cwd=self.project_root
+                cwd=self.project_root,
+                env=self._env,
+                close_fds=False
             )
             return {
                 "success": process.returncode == 0,
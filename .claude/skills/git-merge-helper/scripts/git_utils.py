@@ -11,29 +11,128 @@ Git Merge Helper - Git 工具类
 Generated: 2026-01-04
 """
 
+import configparser
 import os
 import sys
 import platform
 import subprocess
 import threading
 import time
+import weakref
 from pathlib import Path
 from typing import Optional, Tuple
 
+# 可选依赖：pygit2 的 discover_repository 在 C 层完成向上查找，
+# 单次调用替代逐级 stat，也不需要 git 子进程
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
+# 可选依赖：portalocker 统一封装 fcntl/LockFileEx，
+# 可用时文件锁走单一跨平台代码路径
+try:
+    import portalocker
+except ImportError:
+    portalocker = None
+
 
 # ==================== 平台检测 ====================
 IS_WINDOWS = platform.system() == "Windows"
 IS_LINUX = platform.system() == "Linux"
 IS_MACOS = platform.system() == "Darwin"
 
+# 平台锁原语在模块导入时加载一次，
+# 避免 acquire/release 热路径上的函数内 import 查找
+if IS_WINDOWS:
+    import ctypes
+    import msvcrt
+else:
+    import fcntl
+
+
+# ==================== 输出解析辅助 ====================
+def nonempty_lines(s: str) -> list:
+    """
+    按行拆分并去除空行
+
+    splitlines 单次完成拆分且正确处理 \\r\\n（Git for Windows 输出），
+    替代 strip() + split("\\n") + 过滤的三次分配
+
+    Args:
+        s: 命令输出字符串
+
+    Returns:
+        非空行列表（已去除首尾空白）
+    """
+    return [line.strip() for line in s.splitlines() if line.strip()]
+
 
 # ==================== Git 仓库查找 ====================
+
+# find_root 的进程级缓存：起始目录（resolve 后）-> 仓库根目录。
+# 同一进程内 get_logs_dir、MergeLogger、log_cleaner 重复查找时
+# 不再重新走文件系统
+_ROOT_CACHE: dict = {}
+
+
+def clear_root_cache():
+    """清空仓库根目录缓存（测试或仓库结构变化后使用）"""
+    _ROOT_CACHE.clear()
+    GitRepository._inside_repo_cache = None
+
+
 class GitRepository:
     """Git 仓库工具类"""
 
     # 默认最大遍历深度
     DEFAULT_MAX_DEPTH = 50
 
+    # is_inside_repo 的进程级缓存（由 probe 填充）
+    _inside_repo_cache: Optional[bool] = None
+
+    @staticmethod
+    def probe(start_dir: Optional[Path] = None) -> Optional[Path]:
+        """
+        一次 rev-parse 批量获取仓库元信息并填充各缓存
+
+        --show-toplevel 与 --is-inside-work-tree 合并为单个子进程，
+        替代仓库发现阶段的多次独立 git 调用
+
+        Args:
+            start_dir: 起始目录，默认为当前目录
+
+        Returns:
+            仓库根目录路径，不在仓库中或 git 不可用时返回 None
+        """
+        if start_dir is None:
+            start_dir = Path.cwd()
+
+        try:
+            result = subprocess.run(
+                ["git", "rev-parse", "--show-toplevel", "--is-inside-work-tree"],
+                capture_output=True,
+                text=True,
+                check=False,
+                cwd=str(start_dir),
+                timeout=2
+            )
+        except (subprocess.TimeoutExpired, OSError):
+            return None
+
+        if result.returncode != 0:
+            GitRepository._inside_repo_cache = False
+            return None
+
+        # 输出按参数顺序逐行排列：根目录、工作区判定
+        lines = nonempty_lines(result.stdout)
+        toplevel = Path(lines[0]) if lines and lines[0] else None
+        GitRepository._inside_repo_cache = len(lines) > 1 and lines[1] == "true"
+
+        if toplevel is not None:
+            _ROOT_CACHE[start_dir.resolve()] = toplevel
+        return toplevel
+
     @staticmethod
     def find_root(start_dir: Optional[Path] = None, max_depth: int = None) -> Path:
         """
@@ -55,6 +154,40 @@ class GitRepository:
         if max_depth is None:
             max_depth = GitRepository.DEFAULT_MAX_DEPTH
 
+        # 进程级缓存：同一起始目录只做一次真实查找
+        cache_key = start_dir.resolve()
+        cached = _ROOT_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
+        root = GitRepository._find_root_uncached(start_dir, max_depth)
+        _ROOT_CACHE[cache_key] = root
+        return root
+
+    @staticmethod
+    def _find_root_uncached(start_dir: Path, max_depth: int) -> Path:
+        """执行真实的仓库根目录查找（无缓存）"""
+        # pygit2 可用时整个向上查找在 libgit2 内完成：
+        # 零子进程、零逐级 Path 分配
+        if pygit2 is not None:
+            try:
+                found = pygit2.discover_repository(str(start_dir))
+            except Exception:
+                found = None
+            if found:
+                git_dir = Path(found)
+                # discover 返回 .git 目录路径；worktree/submodule 的
+                # gitdir 不在仓库根下，这类场景交给后面的 git 子进程
+                if git_dir.name == ".git":
+                    return git_dir.parent
+
+        # 其次让 git 自己回答：probe 的单次 rev-parse 批量返回
+        # 根目录和工作区判定（顺带填充 is_inside_repo 缓存），
+        # 一个子进程替代最多 50 次 stat，worktree/submodule 场景也正确
+        toplevel = GitRepository.probe(start_dir)
+        if toplevel is not None:
+            return toplevel
+
         original_root = start_dir
         current = start_dir
 
@@ -96,18 +229,17 @@ class GitRepository:
     @staticmethod
     def is_inside_repo() -> bool:
         """
-        检查当前目录是否在 Git 仓库中
+        检查当前目录是否在 Git 仓库中（结果由 probe 缓存）
 
         Returns:
             是否在 Git 仓库中
         """
-        result = subprocess.run(
-            ["git", "rev-parse", "--is-inside-work-tree"],
-            capture_output=True,
-            text=True,
-            check=False
-        )
-        return result.returncode == 0 and result.stdout.strip() == "true"
+        cached = GitRepository._inside_repo_cache
+        if cached is not None:
+            return cached
+
+        GitRepository.probe()
+        return bool(GitRepository._inside_repo_cache)
 
     @staticmethod
     def get_logs_dir(start_dir: Optional[Path] = None) -> Path:
@@ -131,9 +263,70 @@ class GitRepository:
 class GitRemote:
     """Git 远程仓库工具类（线程安全）"""
 
+    # 环境变量优先级最高，便于父 shell 为多个脚本调用统一指定
+    ENV_REMOTE_NAME = "GMH_REMOTE_NAME"
+
+    # 跨进程缓存文件名（位于 .git 目录下，不会被 git 跟踪）
+    CACHE_FILENAME = "gmh-remote-name"
+
     _remote_name_cache: Optional[str] = None
     _cache_lock = threading.Lock()  # 线程安全锁
 
+    @staticmethod
+    def _read_remotes_from_config(repo_root: Path) -> Tuple[str, ...]:
+        """
+        直接解析 .git/config 获取远程名称列表
+
+        远程信息就是 config 里的 [remote "NAME"] 小节，一次打开加
+        一次 INI 解析即可，完全不需要 git 子进程（Windows 上每次
+        进程创建要 30-100ms）
+
+        Args:
+            repo_root: 仓库根目录
+
+        Returns:
+            远程名称元组（按名称排序，与 git remote 输出顺序一致），
+            解析失败返回空元组
+        """
+        config_path = repo_root / ".git" / "config"
+        if not config_path.is_file():
+            # submodule/worktree 场景 .git 是文件，交给子进程路径
+            return ()
+
+        parser = configparser.RawConfigParser(strict=False)
+        try:
+            with open(config_path, encoding="utf-8", errors="ignore") as f:
+                parser.read_file(f)
+        except (OSError, configparser.Error):
+            return ()
+
+        # git remote 按名称排序输出；config 小节是插入顺序，
+        # 必须排序对齐，否则多远程仓库里首选远程会因路径不同而漂移
+        return tuple(sorted(
+            section[8:-1]
+            for section in parser.sections()
+            if section.startswith('remote "') and section.endswith('"')
+        ))
+
+    @staticmethod
+    def _cache_file() -> Optional[Path]:
+        """
+        获取跨进程缓存文件路径
+
+        Returns:
+            缓存文件路径，不在 Git 仓库中时返回 None
+        """
+        repo_root = GitRepository.find_root_safe()
+        if repo_root is None:
+            return None
+
+        git_dir = repo_root / ".git"
+        if not git_dir.is_dir():
+            # submodule/worktree 场景下 .git 是文件，不使用文件缓存
+            return None
+
+        return git_dir / GitRemote.CACHE_FILENAME
+
     @staticmethod
     def get_remote_name() -> str:
         """
@@ -143,46 +336,98 @@ class GitRemote:
             远程仓库名称，默认为 'origin'
 
         Note:
-            结果会被缓存，多次调用只执行一次检测
-            使用锁保证多线程环境下的安全性
+            结果会被缓存，多次调用只执行一次检测；
+            各脚本作为独立进程运行时，通过环境变量 GMH_REMOTE_NAME
+            或 .git/gmh-remote-name 文件缓存避免重复执行 git remote show
         """
-        # 先检查缓存（不加锁，快速路径）
-        if GitRemote._remote_name_cache is not None:
-            return GitRemote._remote_name_cache
+        # 先检查缓存（不加锁，快速路径）：共享属性先取到局部变量，
+        # 热路径只做一次类属性查找，判空和返回都用局部引用
+        cached = GitRemote._remote_name_cache
+        if cached is not None:
+            return cached
 
         # 缓存未命中，加锁检测
         with GitRemote._cache_lock:
             # 双重检查：可能在等待锁时其他线程已经设置了缓存
-            if GitRemote._remote_name_cache is not None:
+            cached = GitRemote._remote_name_cache
+            if cached is not None:
+                return cached
+
+            # 环境变量优先（父 shell 可为所有子进程统一指定）
+            env_remote = os.environ.get(GitRemote.ENV_REMOTE_NAME, "").strip()
+            if env_remote:
+                GitRemote._remote_name_cache = env_remote
                 return GitRemote._remote_name_cache
 
-            # 执行远程名称检测
+            # 跨进程文件缓存（branch_selector / conflict_checker 等
+            # 作为独立脚本运行时复用同一次检测结果）
+            cache_file = GitRemote._cache_file()
+            if cache_file is not None and cache_file.exists():
+                try:
+                    # 缓存必须比 .git/config 新：config 变更（换远程、
+                    # 改 URL）后旧缓存自动失效，重新检测
+                    config_file = cache_file.parent / "config"
+                    stale = (config_file.exists()
+                             and config_file.stat().st_mtime
+                             >= cache_file.stat().st_mtime)
+                    if not stale:
+                        cached = cache_file.read_text(encoding="utf-8").strip()
+                        if cached:
+                            GitRemote._remote_name_cache = cached
+                            return GitRemote._remote_name_cache
+                except OSError:
+                    pass  # 缓存损坏或不可读，退回正常检测
+
+            # 执行远程名称检测：优先直接解析 .git/config（零子进程）
             detected = None
-            try:
-                result = subprocess.run(
-                    ["git", "remote", "show"],
-                    capture_output=True,
-                    text=True,
-                    check=False,
-                    timeout=10
-                )
-                if result.returncode == 0 and result.stdout.strip():
-                    remotes = result.stdout.strip().split("\n")
-                    if remotes:
-                        detected = remotes[0].strip()
-            except (subprocess.TimeoutExpired, OSError):
-                # 超时或系统错误，使用默认值
-                pass
+            repo_root = GitRepository.find_root_safe()
+            if repo_root is not None:
+                remotes = GitRemote._read_remotes_from_config(repo_root)
+                if remotes:
+                    detected = remotes[0]
+
+            if detected is None:
+                try:
+                    # 裸 git remote 只读 .git/config，不联网
+                    #（remote show 在部分版本会查询远端），超时可以收紧
+                    result = subprocess.run(
+                        ["git", "remote"],
+                        capture_output=True,
+                        text=True,
+                        check=False,
+                        timeout=2
+                    )
+                    if result.returncode == 0:
+                        remotes = nonempty_lines(result.stdout)
+                        if remotes:
+                            detected = remotes[0]
+                except (subprocess.TimeoutExpired, OSError):
+                    # 超时或系统错误，使用默认值
+                    pass
 
             # 设置缓存（在锁内）
             GitRemote._remote_name_cache = detected if detected else "origin"
+
+            # 写入跨进程缓存（失败不影响结果）
+            if detected and cache_file is not None:
+                try:
+                    cache_file.write_text(detected + "\n", encoding="utf-8")
+                except OSError:
+                    pass
+
             return GitRemote._remote_name_cache
 
     @staticmethod
     def clear_cache():
-        """清除远程名称缓存（线程安全）"""
+        """清除远程名称缓存（线程安全，同时清除文件缓存）"""
         with GitRemote._cache_lock:
             GitRemote._remote_name_cache = None
+            cache_file = GitRemote._cache_file()
+            if cache_file is not None:
+                try:
+                    cache_file.unlink()
+                except OSError:
+                    pass
 
     @staticmethod
     def get_all_remotes() -> Tuple[str, ...]:
@@ -192,6 +437,13 @@ class GitRemote:
         Returns:
             远程仓库名称元组
         """
+        # 优先直接解析 .git/config（零子进程）
+        repo_root = GitRepository.find_root_safe()
+        if repo_root is not None:
+            remotes = GitRemote._read_remotes_from_config(repo_root)
+            if remotes:
+                return remotes
+
         try:
             result = subprocess.run(
                 ["git", "remote"],
@@ -200,9 +452,8 @@ class GitRemote:
                 check=False,
                 timeout=10
             )
-            if result.returncode == 0 and result.stdout.strip():
-                remotes = result.stdout.strip().split("\n")
-                return tuple(r.strip() for r in remotes if r.strip())
+            if result.returncode == 0:
+                return tuple(nonempty_lines(result.stdout))
         except (subprocess.TimeoutExpired, OSError):
             # 超时或系统错误，返回空元组
             pass
@@ -214,8 +465,10 @@ class FileLock:
     """
     跨平台文件锁
 
+    优先使用 portalocker（可用时，统一的跨平台路径），
+    否则回退到平台实现：
     Unix/Linux: 使用 fcntl
-    Windows: 使用 msvcrt.locking
+    Windows: 使用 LockFileEx
     """
 
     def __init__(self, lock_path: Path):
@@ -228,6 +481,10 @@ class FileLock:
         self.lock_path = lock_path
         self.lock_file = None
         self._is_locked = False
+        # 兜底清理：对象被回收时关闭锁文件（关闭即释放锁）。
+        # 传 __dict__ 而非 self，finalize 不持有实例引用；
+        # 正常用法仍应显式 with 或 release，这里只是安全网
+        self._finalizer = weakref.finalize(self, self._finalize, self.__dict__)
 
     def acquire(self, blocking: bool = False) -> bool:
         """
@@ -244,6 +501,8 @@ class FileLock:
 
         try:
             # 尝试创建锁文件
+            if portalocker is not None:
+                return self._acquire_portalocker(blocking)
             if IS_WINDOWS:
                 return self._acquire_windows(blocking)
             else:
@@ -251,10 +510,34 @@ class FileLock:
         except (IOError, OSError):
             return False
 
+    def _acquire_portalocker(self, blocking: bool) -> bool:
+        """跨平台获取锁（使用 portalocker）"""
+        try:
+            # 原子性创建文件
+            try:
+                self.lock_file = open(self.lock_path, 'x')
+            except FileExistsError:
+                self.lock_file = open(self.lock_path, 'r')
+
+            flags = portalocker.LOCK_EX
+            if not blocking:
+                flags |= portalocker.LOCK_NB
+
+            portalocker.lock(self.lock_file, flags)
+            self._is_locked = True
+            return True
+        except Exception:
+            # 锁被占用或 I/O 失败
+            if self.lock_file:
+                try:
+                    self.lock_file.close()
+                except Exception:
+                    pass
+                self.lock_file = None
+            return False
+
     def _acquire_unix(self, blocking: bool) -> bool:
         """Unix/Linux 平台获取锁（使用 fcntl）"""
-        import fcntl
-
         try:
             # 原子性创建文件
             try:
@@ -279,63 +562,44 @@ class FileLock:
                 self.lock_file = None
             return False
 
+    # LockFileEx 标志位
+    _LOCKFILE_FAIL_IMMEDIATELY = 0x1
+    _LOCKFILE_EXCLUSIVE_LOCK = 0x2
+
     def _acquire_windows(self, blocking: bool) -> bool:
         """
-        Windows 平台获取锁（使用 msvcrt）
+        Windows 平台获取锁（使用 LockFileEx）
+
+        阻塞模式下由内核在锁释放时直接唤醒等待者，
+        替代 msvcrt.locking 的 100ms 轮询循环
+        （最多约 100 次 sleep + 系统调用的延迟和开销）
 
         支持 blocking 参数：
-        - blocking=False: 非阻塞，立即返回
-        - blocking=True: 阻塞等待，最多等待 10 秒
+        - blocking=False: LOCKFILE_FAIL_IMMEDIATELY，立即返回
+        - blocking=True: 内核级等待，锁释放即唤醒
         """
-        import msvcrt
-        import os
-
-        mode = os.O_RDWR | os.O_CREAT
-        max_wait_seconds = 10  # 阻塞模式下最多等待 10 秒
-        retry_interval = 0.1   # 重试间隔 100ms
-
-        start_time = time.time()
-
-        while True:
-            try:
-                # 打开文件
-                fd = os.open(self.lock_path, mode, 0o666)
-
-                try:
-                    # 尝试非阻塞锁定
-                    # LK_NBLCK = 非阻塞排他锁
-                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
-                    # 锁定成功
-                    self.lock_file = os.fdopen(fd, 'w')
-                    self._is_locked = True
-                    return True
-
-                except OSError:
-                    # 锁定失败（文件已被锁定）
-                    os.close(fd)
-
-                    if not blocking:
-                        # 非阻塞模式：立即返回失败
-                        return False
-
-                    # 阻塞模式：检查是否超时
-                    if time.time() - start_time >= max_wait_seconds:
-                        return False
+        try:
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o666)
+        except OSError:
+            return False
 
-                    # 等待后重试
-                    time.sleep(retry_interval)
-                    continue
+        flags = self._LOCKFILE_EXCLUSIVE_LOCK
+        if not blocking:
+            flags |= self._LOCKFILE_FAIL_IMMEDIATELY
 
-            except (IOError, OSError) as e:
-                # 打开文件失败
-                if not blocking:
-                    return False
+        # 清零的 OVERLAPPED 结构：锁定范围从偏移 0 开始
+        overlapped = ctypes.create_string_buffer(32)
 
-                # 阻塞模式：检查是否超时
-                if time.time() - start_time >= max_wait_seconds:
-                    return False
+        ok = ctypes.windll.kernel32.LockFileEx(
+            msvcrt.get_osfhandle(fd), flags, 0, 1, 0, overlapped
+        )
+        if not ok:
+            os.close(fd)
+            return False
 
-                time.sleep(retry_interval)
+        self.lock_file = os.fdopen(fd, "w")
+        self._is_locked = True
+        return True
 
     def release(self):
         """释放文件锁"""
@@ -344,13 +608,16 @@ class FileLock:
 
         if self.lock_file:
             try:
-                if IS_WINDOWS:
-                    import msvcrt
-                    fd = self.lock_file.fileno()
-                    # 解锁
-                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+                if portalocker is not None:
+                    portalocker.unlock(self.lock_file)
+                elif IS_WINDOWS:
+                    # 与 LockFileEx 对应的解锁调用
+                    overlapped = ctypes.create_string_buffer(32)
+                    ctypes.windll.kernel32.UnlockFileEx(
+                        msvcrt.get_osfhandle(self.lock_file.fileno()),
+                        0, 1, 0, overlapped
+                    )
                 else:
-                    import fcntl
                     fcntl.flock(self.lock_file.fileno(), fcntl.LOCK_UN)
             except Exception:
                 pass  # 忽略释放锁时的错误
@@ -372,9 +639,24 @@ class FileLock:
         """支持 with 语句"""
         self.release()
 
-    def __del__(self):
-        """析构时释放锁"""
-        self.release()
+    @staticmethod
+    def _finalize(state: dict):
+        """
+        weakref.finalize 回调：关闭仍打开的锁文件
+
+        与 __del__ 不同，finalize 在解释器退出时也保证执行，
+        且不会因回调异常产生 "Exception ignored" 噪音
+
+        Args:
+            state: 实例的 __dict__（避免 finalize 持有实例强引用）
+        """
+        lock_file = state.get("lock_file")
+        if lock_file is None:
+            return
+        try:
+            lock_file.close()
+        except Exception:
+            pass
 
 
 # ==================== Git 命令辅助 ====================
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Git Merge Helper - 统一驱动入口
+
+功能：
+- 一个进程内完成分支查看、冲突检测、冲突分析、配置查看和合并
+- 各组件共享同一份配置和远程名称检测结果
+- 避免按子命令多次启动 Python（每次冷启动约 80ms）
+
+用法：
+    python3 gmh.py branches            # 查看分支
+    python3 gmh.py conflicts           # 检测冲突
+    python3 gmh.py config              # 查看配置
+    python3 gmh.py merge [目标分支...]  # 执行合并
+
+Generated: 2026-01-04
+"""
+
+import argparse
+import sys
+
+from config import MergeConfig
+from git_utils import GitRemote
+
+
+def cmd_branches(args, config):
+    """查看当前分支和远程分支列表"""
+    from branch_selector import BranchSelector
+
+    selector = BranchSelector(non_interactive=True, refresh=args.refresh)
+    current, branches = selector.get_branches()
+
+    print(f"当前分支: {current}")
+    print(f"远程分支 ({len(branches)} 个):")
+    for branch in branches:
+        marker = " ← 当前分支" if branch == current else ""
+        print(f"  - {branch}{marker}")
+
+    return 0
+
+
+def cmd_conflicts(args, config):
+    """检测并分析合并冲突"""
+    from conflict_checker import ConflictChecker
+    from conflict_resolver import ConflictResolver
+
+    checker = ConflictChecker()
+
+    if not checker.check_conflicts():
+        print(checker.get_conflict_summary())
+        return 0
+
+    print(checker.format_conflict_report())
+
+    # 复用同一份配置构造 resolver
+    resolver = ConflictResolver(config=config)
+    result = resolver.resolve_all_conflicts(checker.get_conflicted_files())
+    print("\n" + result["summary"])
+
+    return 1
+
+
+def cmd_config(args, config):
+    """查看当前配置"""
+    print(config.get_summary())
+    return 0
+
+
+def cmd_merge(args, config):
+    """执行合并流程"""
+    from merge_executor import MergeExecutor
+
+    executor = MergeExecutor(config=config)
+
+    if len(args.targets) > 1:
+        success = executor.execute(target_branches=args.targets)
+    else:
+        target = args.targets[0] if args.targets else None
+        success = executor.execute(target)
+
+    return 0 if success else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """构建命令行参数解析器"""
+    parser = argparse.ArgumentParser(
+        prog="gmh",
+        description="Git Merge Helper 统一入口"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    branches = subparsers.add_parser("branches", help="查看分支列表")
+    branches.add_argument("--refresh", action="store_true",
+                          help="直接查询远程（git ls-remote）")
+    branches.set_defaults(func=cmd_branches)
+
+    conflicts = subparsers.add_parser("conflicts", help="检测合并冲突")
+    conflicts.set_defaults(func=cmd_conflicts)
+
+    config_cmd = subparsers.add_parser("config", help="查看配置")
+    config_cmd.set_defaults(func=cmd_config)
+
+    merge = subparsers.add_parser("merge", help="执行合并")
+    merge.add_argument("targets", nargs="*", help="目标分支（可多个）")
+    merge.set_defaults(func=cmd_merge)
+
+    return parser
+
+
+def main():
+    """命令行入口"""
+    parser = build_parser()
+    args = parser.parse_args()
+
+    # 配置与远程名称在进程内只加载/检测一次，所有子命令共享
+    config = MergeConfig.load()
+    GitRemote.get_remote_name()
+
+    sys.exit(args.func(args, config))
+
+
+if __name__ == "__main__":
+    main()
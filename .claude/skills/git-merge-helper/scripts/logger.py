@@ -13,13 +13,33 @@ Generated: 2026-01-04
 """
 
 import os
+import re
+import string
 import sys
 import platform
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 import urllib.parse
 
+# 分支名清洗表（模块导入时构建一次）：
+# 保留字母数字和 -_.，路径分隔符替换为 -，其余字符删除。
+# str.translate 的逐字符循环在 C 层完成，比 Python 级生成式快一个量级
+_SANITIZE_ALLOWED = set(string.ascii_letters + string.digits + "-_.")
+_SANITIZE_TABLE = {
+    cp: (cp if chr(cp) in _SANITIZE_ALLOWED
+         else (ord("-") if chr(cp) in "/\\" else None))
+    for cp in range(128)
+}
+
+# 非 ASCII 分支名的回退：\w 保留 Unicode 字母数字（与 isalnum 语义一致）
+_SANITIZE_FALLBACK_RE = re.compile(r"[^\w.\-]")
+
+# 快速路径：绝大多数分支名只含安全字符和 /（如 feature/user-login），
+# 一次 fullmatch 命中后仅需 str.replace，连 translate 的映射表都省掉
+_SANITIZE_FASTPATH = re.compile(r"[A-Za-z0-9._/\-]+").fullmatch
+
 # 导入 Git 工具类
 try:
     from git_utils import GitRepository
@@ -121,6 +141,10 @@ class MergeLogger:
         self.target_branches = []  # 批量合并时的目标分支列表
         self.temp_branch = ""
         self.start_time = datetime.now()
+        # 单调时钟锚点：日志时间戳由 start_time + 单调偏移推算，
+        # 既省掉每条日志的 datetime.now() 系统调用，
+        # 也不受运行期间墙钟被 NTP/手动调整的影响
+        self._start_mono = time.monotonic()
         self.steps = []
 
         # 标记是否为批量合并
@@ -136,12 +160,17 @@ class MergeLogger:
         Returns:
             清理后的分支名
         """
-        # 替换 / 为 -
-        # 移除其他特殊字符
+        # 最常见形态（安全字符 + /）：只需把路径分隔符换成 -
+        if _SANITIZE_FASTPATH(branch_name):
+            return branch_name.replace("/", "-")
+
+        # ASCII 快速路径：单次 C 层 translate 完成替换和删除
+        if branch_name.isascii():
+            return branch_name.translate(_SANITIZE_TABLE)
+
+        # 非 ASCII：先统一路径分隔符，再用预编译正则删除特殊字符
         sanitized = branch_name.replace("/", "-").replace("\\", "-")
-        # 只保留字母、数字、连字符、下划线和点
-        sanitized = "".join(c if c.isalnum() or c in "-_." else "" for c in sanitized)
-        return sanitized
+        return _SANITIZE_FALLBACK_RE.sub("", sanitized)
 
     def _generate_log_filename(self) -> Path:
         """
@@ -181,7 +210,8 @@ class MergeLogger:
             message: 日志消息
             details: 详细信息（可选）
         """
-        timestamp = datetime.now().strftime("[%H:%M:%S.%f")[:-3]
+        now = self.start_time + timedelta(seconds=time.monotonic() - self._start_mono)
+        timestamp = now.strftime("[%H:%M:%S.%f")[:-3]
         icon = {
             "INFO": "✓",
             "SUCCESS": "✅",
@@ -263,29 +293,37 @@ class MergeLogger:
 
         duration = (datetime.now() - self.start_time).total_seconds()
 
-        content = f"""合并日志 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-{'='*60}
-当前分支:    {self.current_branch}"""
+        # 各段先收集到列表，最后一次 join 拼接——
+        # 字符串 += 每次都整串拷贝，步骤多时是 O(n²)
+        parts = [
+            f"合并日志 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            "=" * 60,
+            f"当前分支:    {self.current_branch}",
+        ]
 
         if self.is_batch_merge and self.target_branches:
-            content += f"\n目标分支:    {', '.join(self.target_branches)}"
+            parts.append(f"目标分支:    {', '.join(self.target_branches)}")
         else:
-            content += f"\n目标分支:    {self.target_branch}"
+            parts.append(f"目标分支:    {self.target_branch}")
 
         if self.temp_branch:
-            content += f"\n临时分支:    {self.temp_branch}"
-        content += f"\n状态:        {self.status}"
+            parts.append(f"临时分支:    {self.temp_branch}")
+        parts.append(f"状态:        {self.status}")
         if self.reason:
-            content += f"\n原因:        {self.reason}"
-        content += f"\n耗时:        {duration:.2f} seconds"
+            parts.append(f"原因:        {self.reason}")
+        parts.append(f"耗时:        {duration:.2f} seconds")
+
+        parts.append("")
+        parts.append("操作步骤：")
+        parts.extend(self.steps)
 
-        content += "\n\n操作步骤：\n"
-        for step in self.steps:
-            content += f"{step}\n"
+        content = "\n".join(parts) + "\n"
 
-        # 写入文件
-        with open(self.log_file, "w", encoding="utf-8") as f:
-            f.write(content)
+        # 一次性写入字节串（跳过 TextIOWrapper 的增量编码层），
+        # 先写临时文件再 os.replace 原子落盘——中途被杀不会留下半截日志
+        tmp_file = self.log_file.with_suffix(".log.tmp")
+        tmp_file.write_bytes(content.encode("utf-8"))
+        os.replace(tmp_file, self.log_file)
 
         # 自动清理过期日志
         try:
@@ -11,8 +11,13 @@ Git Merge Helper - 合并执行器
 Generated: 2026-01-04
 """
 
+import io
+import re
+import shlex
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -25,7 +30,12 @@ from conflict_resolver import ConflictResolver
 from merge_prechecker import MergePrechecker, PrecheckStatus
 from git_status_checker import GitStatusChecker, StatusCode
 from git_network_helper import GitNetworkHelper, NetworkError
-from git_utils import GitRepository, GitRemote, FileLock
+import git_utils
+from git_utils import GitRepository, GitRemote, FileLock, IS_WINDOWS
+from git_cat_file import GitCatFile
+
+# 合并输出的变更文件数统计（模块加载时编译一次）
+_FILES_CHANGED_RE = re.compile(r"(\d+) files? changed", re.IGNORECASE)
 
 
 class MergeExecutor:
@@ -49,16 +59,56 @@ class MergeExecutor:
 
             self.config = config
 
-            # 初始化各组件，传入配置
-            self.logger = MergeLogger()
-            self.selector = BranchSelector()
-            self.checker = ConflictChecker()
-            self.resolver = ConflictResolver(config=config)
-            self.prechecker = MergePrechecker(config=config)
-            self.status_checker = GitStatusChecker()
+            # 并行实例化相互独立的组件：各自的仓库探测、正则编译
+            # 和文件 IO 重叠执行，冷启动的构造耗时约等于最慢的
+            # 单个组件，而非全部组件之和
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                logger_future = pool.submit(MergeLogger)
+                selector_future = pool.submit(BranchSelector)
+                checker_future = pool.submit(ConflictChecker)
+                resolver_future = pool.submit(ConflictResolver, config=config)
+                prechecker_future = pool.submit(MergePrechecker, config=config)
+                status_future = pool.submit(GitStatusChecker)
+
+            self.logger = logger_future.result()
+            self.selector = selector_future.result()
+            self.checker = checker_future.result()
+            self.resolver = resolver_future.result()
+            self.prechecker = prechecker_future.result()
+            self.status_checker = status_future.result()
+
+            # network_helper 依赖 logger，放在并行区之后构造
             self.network_helper = GitNetworkHelper(self.logger, config)
             self.temp_branch = ""
 
+            # 常驻 cat-file 进程：引用存在性查询走管道往返，
+            # 不再为每次探测 fork+exec 一个 git（进程按需启动）
+            self._object_reader = GitCatFile()
+
+            # 常驻 update-ref --stdin 进程：本会话删除任意多个
+            # 临时分支引用共用一个子进程（按需启动，见 _delete_ref）
+            self._ref_updater = None
+
+            # 仓库信息（首次探测后缓存，见 _probe_repo）
+            self._repo_info = None
+
+            # 批量模式的预拉取结果缓存：{分支名: GitOperationResult}
+            self._prefetched = {}
+
+            # 预检确认"远程未前进"的分支集合（无须再 fetch）
+            self._up_to_date = set()
+
+            # 远程名称在一次运行内不变，首次检测后缓存在实例上
+            self._remote_name: Optional[str] = None
+
+            # 后台日志写入：save() 的文件 I/O 移出关键路径，
+            # 单 worker 保证同一 logger 的写入顺序
+            self._log_pool = ThreadPoolExecutor(max_workers=1)
+
+            # 批量模式的输出缓冲：整段内容一次 write 刷出，
+            # 替代逐行 print 的逐次 write 系统调用
+            self._print_buf = io.StringIO()
+
             # 并发锁（使用跨平台的 FileLock）
             self.file_lock = None
 
@@ -89,11 +139,109 @@ class MergeExecutor:
         lock_path = logs_dir / ".merge.lock"
         self.file_lock = FileLock(lock_path)
 
-        # 尝试获取非阻塞锁
-        return self.file_lock.acquire(blocking=False)
+        # 乐观重试 + 指数退避：对方合并即将结束时不必直接报失败，
+        # 总预算由 config.lock_timeout_s 控制（CI 可调大或设 0 禁用）
+        budget = getattr(self.config, "lock_timeout_s", 2.0)
+        waited = 0.0
+        for delay in (0, 0.05, 0.1, 0.2, 0.5, 1.0):
+            if delay:
+                if waited + delay > budget:
+                    break
+                time.sleep(delay)
+                waited += delay
+            if self.file_lock.acquire(blocking=False):
+                return True
+        return False
+
+    def _bprint(self, text: str = ""):
+        """写入输出缓冲（配合 _flush_prints 在阶段边界一次刷出）"""
+        self._print_buf.write(text + "\n")
+
+    def _flush_prints(self):
+        """把缓冲的输出一次性写到 stdout"""
+        data = self._print_buf.getvalue()
+        if data:
+            sys.stdout.write(data)
+            sys.stdout.flush()
+            self._print_buf.seek(0)
+            self._print_buf.truncate(0)
+
+    def _save_log_async(self):
+        """
+        在后台线程保存日志
+
+        用户可见的结果先输出，文件写入延后完成；
+        execute 的 finally 会等待全部写入落盘
+        """
+        self._log_pool.submit(self.logger.save)
+
+    def _delete_ref(self, branch_name: str) -> bool:
+        """
+        通过常驻 update-ref --stdin 进程删除本地分支引用
+
+        -z 模式下一条命令是 "delete <ref>" NUL <old-oid> NUL，
+        old-oid 留空表示无条件删除；管道异常时返回 False，
+        调用方回退到 branch -D 子进程
+
+        Args:
+            branch_name: 本地分支名（不含 refs/heads/ 前缀）
+
+        Returns:
+            删除请求是否成功写入
+        """
+        try:
+            if self._ref_updater is None or self._ref_updater.poll() is not None:
+                self._ref_updater = subprocess.Popen(
+                    ["git", "update-ref", "--stdin", "-z"],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    bufsize=0,
+                    close_fds=False
+                )
+
+            self._ref_updater.stdin.write(
+                b"delete refs/heads/" + branch_name.encode("utf-8") + b"\0\0"
+            )
+            self._ref_updater.stdin.flush()
+            return self._ref_updater.poll() is None
+        except (OSError, ValueError, BrokenPipeError):
+            self._ref_updater = None
+            return False
+
+    def _close_ref_updater(self):
+        """关闭常驻 update-ref 进程"""
+        if self._ref_updater is None:
+            return
+        try:
+            self._ref_updater.stdin.close()
+            self._ref_updater.wait(timeout=5)
+        except Exception:
+            pass
+        finally:
+            self._ref_updater = None
+
+    def _ref_exists(self, ref: str) -> bool:
+        """
+        检查引用是否可解析（通过常驻 cat-file 进程）
+
+        Args:
+            ref: 分支名或其他引用
+
+        Returns:
+            引用是否存在
+        """
+        return self._object_reader.check(ref) is not None
 
     def _release_lock(self):
         """释放合并锁"""
+        # 合并流程结束，关闭常驻子进程
+        try:
+            self._object_reader.close()
+        except Exception:
+            pass
+        self._close_ref_updater()
+
         if self.file_lock:
             try:
                 self.file_lock.release()
@@ -113,21 +261,108 @@ class MergeExecutor:
         Returns:
             subprocess.CompletedProcess 对象
         """
+        # 显式 64KB 管道缓冲：status/merge 在大仓库上可能输出数 MB，
+        # 大块读取减少 read 系统调用次数。
+        # close_fds=False：本模块不持有非 CLOEXEC 描述符（PEP 446 后
+        # Python 创建的 fd 默认 CLOEXEC），放行后 CPython 走
+        # posix_spawn 快速路径，避免 fork 复制 Python 堆的页表
         return subprocess.run(
             ["git"] + args,
             capture_output=True,
             text=True,
-            check=check
+            check=check,
+            bufsize=1 << 16,
+            close_fds=False
+        )
+
+    def _run_chained(self, commands: list) -> bool:
+        """
+        把多条本地 git 命令用 && 串成一次 shell 调用
+
+        成功路径上 N 条命令只付一次 Python 侧 fork+exec；
+        任何一条失败整体返回 False，由调用方回退到逐条执行，
+        保留每一步的可读错误信息
+
+        Args:
+            commands: git 参数列表的列表（不含 "git" 本身）
+
+        Returns:
+            整条链是否全部成功
+        """
+        if IS_WINDOWS:
+            # cmd.exe 的引用规则与 shlex 不兼容，Windows 走逐条路径
+            return False
+
+        cmd = " && ".join(
+            " ".join(["git"] + [shlex.quote(str(a)) for a in args])
+            for args in commands
         )
+        result = subprocess.run(cmd, shell=True, capture_output=True,
+                                text=True, close_fds=False)
+        return result.returncode == 0
+
+    def _probe_repo(self) -> Optional[dict]:
+        """
+        一次性探测仓库信息
+
+        rev-parse 支持一次调用回答多个查询，四项信息
+        （是否在工作树内、根目录、git 目录、当前分支）
+        合并为单个子进程，替代逐项的 4 次 fork+exec
+
+        Returns:
+            仓库信息字典（toplevel/git_common_dir/head_branch），
+            不在 Git 仓库内时返回 None
+        """
+        if self._repo_info is not None:
+            return self._repo_info
+
+        # config/logger 初始化时可能已经探测过仓库：
+        # 明确不在仓库内时直接短路，省掉注定失败的 rev-parse
+        if GitRepository._inside_repo_cache is False:
+            return None
+
+        result = self.run_git(
+            ["rev-parse", "--is-inside-work-tree", "--show-toplevel",
+             "--git-common-dir", "--abbrev-ref", "HEAD"],
+            check=False
+        )
+        if result.returncode != 0:
+            return None
+
+        lines = result.stdout.splitlines()
+        if len(lines) < 4 or lines[0].strip() != "true":
+            return None
+
+        self._repo_info = {
+            "toplevel": lines[1].strip(),
+            "git_common_dir": lines[2].strip(),
+            "head_branch": lines[3].strip(),
+        }
+
+        # 探测结果回灌 GitRepository 的缓存，
+        # 后续 find_root / is_inside_repo 调用不再各自起子进程
+        GitRepository._inside_repo_cache = True
+        try:
+            git_utils._ROOT_CACHE[Path.cwd().resolve()] = \
+                Path(self._repo_info["toplevel"])
+        except OSError:
+            pass
+
+        return self._repo_info
 
     def _get_remote_name(self) -> str:
         """
-        自动检测远程仓库名称
+        自动检测远程仓库名称（实例级缓存）
+
+        pull_latest_code / push_and_cleanup / 批量预检都会取远程名，
+        而它在一次运行内不会变化，只探测一次
 
         Returns:
             远程仓库名称，默认为 'origin'
         """
-        return GitRemote.get_remote_name()
+        if self._remote_name is None:
+            self._remote_name = GitRemote.get_remote_name()
+        return self._remote_name
 
     def check_environment(self) -> bool:
         """
@@ -136,9 +371,8 @@ class MergeExecutor:
         Returns:
             环境是否满足要求
         """
-        # 检查 Git 仓库
-        result = self.run_git(["rev-parse", "--is-inside-work-tree"], check=False)
-        if result.returncode != 0:
+        # 检查 Git 仓库（批量 rev-parse，结果全程缓存）
+        if self._probe_repo() is None:
             self.logger.log("ERROR", "不是 Git 仓库", "请在 Git 仓库中运行")
             return False
 
@@ -208,6 +442,12 @@ class MergeExecutor:
         timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
         self.temp_branch = f"merge-{current_branch}-to-{target_branch}-{timestamp}"
 
+        # 目标分支不可解析时提前失败，省掉注定失败的 checkout 子进程
+        if not self._ref_exists(target_branch):
+            self.logger.log("ERROR", "创建临时分支失败",
+                          f"目标分支 {target_branch} 不存在")
+            return False
+
         result = self.run_git(
             ["checkout", "-b", self.temp_branch, target_branch],
             check=False
@@ -232,7 +472,20 @@ class MergeExecutor:
             是否成功
         """
         remote = self._get_remote_name()
-        result = self.network_helper.fetch_branch(branch, remote=remote)
+
+        # 预检的 ls-remote sha 与本地 remote-tracking 引用一致：
+        # 远程没有新内容，fetch 不会带回任何对象，直接跳过
+        if branch in self._up_to_date:
+            self._up_to_date.discard(branch)
+            self.logger.log("INFO", f"拉取 {branch} 分支最新代码",
+                          "预检确认远程未更新，跳过 fetch")
+            return True
+
+        # 批量模式下预拉取已完成：直接消费缓存结果，不再重复 fetch
+        # （pop 而非 get，保证同一分支的后续拉取重新走网络）
+        result = self._prefetched.pop(branch, None)
+        if result is None:
+            result = self.network_helper.fetch_branch(branch, remote=remote)
 
         if not result.success:
             error_msg = result.error_message or "未知错误"
@@ -270,8 +523,7 @@ class MergeExecutor:
         output = result.stdout
         if "changed," in output.lower() or "insertion" in output.lower():
             # 尝试提取文件数量
-            import re
-            match = re.search(r"(\d+) files? changed", output, re.IGNORECASE)
+            match = _FILES_CHANGED_RE.search(output)
             files_msg = match.group(0) if match else "多个文件"
             self.logger.log("INFO", f"合并 {source_branch} 分支", files_msg)
         else:
@@ -293,6 +545,15 @@ class MergeExecutor:
 
         # 切换回原分支
         current = self.logger.current_branch
+
+        # 成功路径：返回原分支 + 删除临时分支合并为一次 shell 调用
+        if (self.temp_branch
+                and self._ref_exists(f"refs/heads/{self.temp_branch}")
+                and self._run_chained([["checkout", current],
+                                       ["branch", "-D", self.temp_branch]])):
+            self.logger.log("INFO", "回滚完成", f"已切换回 {current}")
+            return True
+
         result = self.run_git(["checkout", current], check=False)
 
         if result.returncode != 0:
@@ -325,9 +586,10 @@ class MergeExecutor:
             self.logger.steps.append(recovery_steps)
             return False
 
-        # 删除临时分支
-        if self.temp_branch:
-            self.run_git(["branch", "-D", self.temp_branch], check=False)
+        # 删除临时分支（引用已不存在时跳过；优先走常驻 update-ref 管道）
+        if self.temp_branch and self._ref_exists(f"refs/heads/{self.temp_branch}"):
+            if not self._delete_ref(self.temp_branch):
+                self.run_git(["branch", "-D", self.temp_branch], check=False)
 
         self.logger.log("INFO", "回滚完成", f"已切换回 {current}")
         return True
@@ -354,23 +616,32 @@ class MergeExecutor:
                 if result.retries > 0:
                     self.logger.log("INFO", "重试信息", f"已重试 {result.retries} 次")
                 return False
-
-        # 切换到目标分支
-        result = self.run_git(["checkout", target_branch], check=False)
-        if result.returncode != 0:
-            self.logger.log("ERROR", "切换到目标分支失败", result.stderr)
-            return False
-
-        # 合并临时分支
-        if self.temp_branch:
-            result = self.run_git(
-                ["merge", self.temp_branch, "--no-edit"],
-                check=False
-            )
+            # 推送改变了远程分支表，预检器的缓存随之失效
+            self.prechecker.invalidate_ref_cache(remote=remote)
+
+        # 切换到目标分支并合并临时分支
+        # （成功路径两条命令链成一次 shell 调用，失败回退逐条执行）
+        chained = bool(self.temp_branch) and self._run_chained([
+            ["checkout", target_branch],
+            ["merge", self.temp_branch, "--no-edit"],
+        ])
+
+        if not chained:
+            result = self.run_git(["checkout", target_branch], check=False)
             if result.returncode != 0:
-                self.logger.log("ERROR", "合并临时分支失败", result.stderr)
+                self.logger.log("ERROR", "切换到目标分支失败", result.stderr)
                 return False
 
+            # 合并临时分支
+            if self.temp_branch:
+                result = self.run_git(
+                    ["merge", self.temp_branch, "--no-edit"],
+                    check=False
+                )
+                if result.returncode != 0:
+                    self.logger.log("ERROR", "合并临时分支失败", result.stderr)
+                    return False
+
         # 推送目标分支（使用网络重试）
         result = self.network_helper.push_branch(target_branch, remote=remote)
         if not result.success:
@@ -382,12 +653,11 @@ class MergeExecutor:
 
         self.logger.log("SUCCESS", f"推送 {target_branch} 分支",
                       f"已合并到 {target_branch}")
+        # 同上：成功推送后失效分支表缓存
+        self.prechecker.invalidate_ref_cache(remote=remote)
 
         # 删除临时分支
         if self.temp_branch:
-            # 删除本地临时分支
-            self.run_git(["branch", "-D", self.temp_branch], check=False)
-
             # 删除远程临时分支（使用网络重试）
             result = self.network_helper.run_git_with_retry(
                 ["push", remote, "--delete", self.temp_branch],
@@ -399,6 +669,16 @@ class MergeExecutor:
             else:
                 self.logger.log("INFO", "清理临时分支", self.temp_branch)
 
+            # 本地删除 + 返回原分支链成一次 shell 调用
+            if self._run_chained([["branch", "-D", self.temp_branch],
+                                  ["checkout", current]]):
+                self.logger.log("INFO", "返回原分支", current)
+                return True
+
+            # 回退：优先常驻 update-ref 管道，再退到 branch -D 子进程
+            if not self._delete_ref(self.temp_branch):
+                self.run_git(["branch", "-D", self.temp_branch], check=False)
+
         # 切换回原分支
         result = self.run_git(["checkout", current], check=False)
         if result.returncode != 0:
@@ -432,6 +712,11 @@ class MergeExecutor:
             # 释放锁
             self._release_lock()
 
+            # 等待后台日志全部落盘（结果已打印，不影响感知延迟），
+            # 再重建线程池以便同一实例再次 execute
+            self._log_pool.shutdown(wait=True)
+            self._log_pool = ThreadPoolExecutor(max_workers=1)
+
     def _execute_internal(self, target_branch: Optional[str] = None,
                          target_branches: Optional[list] = None) -> bool:
         """
@@ -461,8 +746,9 @@ class MergeExecutor:
             original_current, _ = self.selector.get_branches()
 
             # 🔍 预检所有分支（全部成功或全部失败）
-            print(f"\n🔍 预检 {len(target_branches)} 个分支...")
-            print("-" * 50)
+            self._bprint(f"\n🔍 预检 {len(target_branches)} 个分支...")
+            self._bprint("-" * 50)
+            self._flush_prints()
 
             # 获取远程名称
             remote = self._get_remote_name()
@@ -471,19 +757,20 @@ class MergeExecutor:
                 target_branches, original_current, remote=remote
             )
 
-            # 显示预检结果
+            # 显示预检结果（整段缓冲后一次刷出）
             for result in precheck_results:
                 icon = "✅" if result.can_merge else "❌" if result.status == PrecheckStatus.ERROR else "⚠️ "
-                print(f"  {icon} {result.branch}: {result.message}")
+                self._bprint(f"  {icon} {result.branch}: {result.message}")
 
             # 检查是否可以继续
             summary = self.prechecker.get_summary()
-            print("-" * 50)
+            self._bprint("-" * 50)
 
             if not summary["can_proceed"]:
-                print(f"\n❌ 预检失败，无法执行批量合并")
-                print(f"   成功: {summary['success']}/{summary['total']}")
-                print(f"   错误: {summary['errors']}/{summary['total']}")
+                self._bprint(f"\n❌ 预检失败，无法执行批量合并")
+                self._bprint(f"   成功: {summary['success']}/{summary['total']}")
+                self._bprint(f"   错误: {summary['errors']}/{summary['total']}")
+                self._flush_prints()
 
                 # 记录到日志
                 self.logger = MergeLogger()
@@ -495,15 +782,39 @@ class MergeExecutor:
                     if not result.can_merge:
                         self.logger.log("ERROR", f"{result.branch}: {result.message}", result.details or "")
                 self.logger.set_result("FAILED", "预检失败")
-                self.logger.save()
+                self._save_log_async()
                 self.logger.print_log_link()
 
                 return False
 
             # 预检全部通过，执行批量合并
-            print(f"\n✅ 预检通过，开始批量合并...")
-            print(f"目标分支: {', '.join(target_branches)}")
-            print("-" * 50)
+            self._bprint(f"\n✅ 预检通过，开始批量合并...")
+            self._bprint(f"目标分支: {', '.join(target_branches)}")
+            self._bprint("-" * 50)
+            self._flush_prints()
+
+            # 复用预检结果：ls-remote 的 sha 与本地 remote-tracking
+            # 引用一致的分支远程没有新内容，无须再 fetch
+            precheck_shas = {r.branch: r.remote_sha for r in precheck_results}
+            self._up_to_date = set()
+            to_fetch = []
+            for branch in target_branches:
+                remote_sha = precheck_shas.get(branch)
+                local_sha = self._object_reader.check(
+                    f"refs/remotes/{remote}/{branch}"
+                )
+                if remote_sha and local_sha == remote_sha:
+                    self._up_to_date.add(branch)
+                else:
+                    to_fetch.append((branch, remote))
+
+            # 并行预拉取其余目标分支：各 fetch 相互独立，
+            # 网络往返重叠执行后由 pull_latest_code 消费缓存结果，
+            # 不再在合并循环里逐分支串行 fetch
+            fetched = self.network_helper.fetch_branches(to_fetch)
+            self._prefetched = {
+                branch: result for (branch, _), result in fetched.items()
+            }
 
             results = {}
             merge_errors = []  # 记录合并过程中的错误
@@ -530,16 +841,17 @@ class MergeExecutor:
                     print(f"\n⚠️  合并到 {branch} 失败，停止批量合并")
                     break
 
-            # 打印汇总
-            print("\n" + "=" * 50)
-            print("📊 批量合并结果汇总:")
+            # 打印汇总（整段缓冲后一次刷出）
+            self._bprint("\n" + "=" * 50)
+            self._bprint("📊 批量合并结果汇总:")
             for branch in target_branches:
                 result = results.get(branch, "SKIPPED")
                 status_icon = "✅" if result == "SUCCESS" else "❌" if result == "FAILED" else "⏭️ "
-                print(f"  {status_icon} {branch}: {result}")
+                self._bprint(f"  {status_icon} {branch}: {result}")
 
             success_count = sum(1 for r in results.values() if r == "SUCCESS")
-            print(f"\n成功: {success_count}/{len(target_branches)}")
+            self._bprint(f"\n成功: {success_count}/{len(target_branches)}")
+            self._flush_prints()
 
             # 如果有错误，记录详细日志
             if merge_errors:
@@ -549,7 +861,7 @@ class MergeExecutor:
                 self.logger.is_batch_merge = True
                 self.logger.log("INFO", "批量合并结果", f"成功: {success_count}/{len(target_branches)}")
                 self.logger.set_result("PARTIAL", f"部分分支合并失败: {', '.join(merge_errors)}")
-                self.logger.save()
+                self._save_log_async()
 
             # 返回是否全部成功
             return len(merge_errors) == 0
@@ -581,7 +893,7 @@ class MergeExecutor:
         # 1. 检查环境
         if not self.check_environment():
             self.logger.set_result("FAILED", "环境检查失败")
-            self.logger.save()
+            self._save_log_async()
             return False
 
         # 2. 获取分支信息
@@ -593,7 +905,7 @@ class MergeExecutor:
             if target_branch is None:
                 self.logger.log("INFO", "用户取消操作", "")
                 self.logger.set_result("CANCELLED", "用户取消")
-                self.logger.save()
+                self._save_log_async()
                 return False
 
         self.logger.target_branch = target_branch
@@ -602,13 +914,46 @@ class MergeExecutor:
         count, commits = self.check_commits_ahead(target_branch)
         if count == 0:
             self.logger.set_result("SKIP", "无需合并")
-            self.logger.save()
+            self._save_log_async()
+            return False
+
+        # 4.5 merge-tree 预探测：在对象库内模拟合并，不触碰工作区。
+        # 预测到冲突时直接报告，省去 创建临时分支→merge→回滚 的整套变动
+        probe_files = self.checker.probe_conflicts_via_merge_tree(
+            target_branch, current
+        )
+        if probe_files:
+            for conflict_file in probe_files:
+                self.logger.log("ERROR", f"冲突文件: {conflict_file}",
+                              "merge-tree 预测")
+
+            # 合并尚未执行，工作区文件里没有冲突标记，
+            # 基于标记的冲突块分析在这里没有意义（会误报 0 个冲突块）；
+            # 只列出预测到的文件和处理建议
+            file_list = "\n".join(f"  - {f}" for f in probe_files)
+            self.logger.steps.append(
+                f"\n预测到 {len(probe_files)} 个文件将发生冲突：\n{file_list}"
+            )
+            commands = self.resolver.get_resolution_commands(probe_files)
+            self.logger.steps.append("\n".join(commands))
+
+            self.logger.set_result(
+                "FAILED",
+                f"预测到冲突 ({len(probe_files)} 个文件，工作区未变动)"
+            )
+            self._save_log_async()
+
+            print(f"\n🔴 预测到 {len(probe_files)} 个文件将发生冲突（工作区未变动）")
+            print(file_list)
+            print("\n⚠️  合并未执行，请参考上方建议先处理冲突")
+            self.logger.print_log_link()
+
             return False
 
         # 5. 创建临时分支
         if not self.create_temp_branch(target_branch):
             self.logger.set_result("FAILED", "创建临时分支失败")
-            self.logger.save()
+            self._save_log_async()
             return False
 
         # 6. 拉取最新代码
@@ -618,7 +963,7 @@ class MergeExecutor:
         if not self.merge_branch(current):
             self.rollback()
             self.logger.set_result("FAILED", "合并失败")
-            self.logger.save()
+            self._save_log_async()
             return False
 
         # 8. 检查冲突
@@ -648,7 +993,7 @@ class MergeExecutor:
             self.rollback()
 
             self.logger.set_result("FAILED", f"检测到冲突 ({resolution_result['total_files']} 个文件, {resolution_result['total_blocks']} 个冲突块)")
-            self.logger.save()
+            self._save_log_async()
 
             # 打印冲突报告
             print(f"\n🔴 检测到 {len(conflict_files)} 个文件有冲突")
@@ -666,12 +1011,12 @@ class MergeExecutor:
         if not self.push_and_cleanup(target_branch):
             self.rollback()
             self.logger.set_result("FAILED", "推送失败")
-            self.logger.save()
+            self._save_log_async()
             return False
 
         # 11. 完成
         self.logger.set_result("SUCCESS")
-        self.logger.save()
+        self._save_log_async()
 
         print(f"\n✅ 成功合并到 {target_branch} 分支")
         self.logger.print_log_link()
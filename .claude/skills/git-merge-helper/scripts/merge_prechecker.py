@@ -11,8 +11,18 @@ Git Merge Helper - 合并预检器
 Generated: 2026-01-04
 """
 
+import functools
+import hashlib
+import json
+import os
+import re
+import shutil
+import signal
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from pathlib import Path
 from typing import List, Dict, Optional, TYPE_CHECKING
 from enum import Enum
 
@@ -20,6 +30,48 @@ from enum import Enum
 if TYPE_CHECKING:
     from config import MergeConfig
 
+# 可选依赖：pygit2（libgit2 绑定），本地提交计数可免去子进程启动；
+# 未安装时回退 git rev-list 子进程路径
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
+# 导入时解析一次 git 的绝对路径，免去每次调用的 PATH 查找
+#（PATH 各目录的 stat 系统调用）
+_GIT = shutil.which("git") or "git"
+
+
+def _git_env(**extra) -> Dict[str, str]:
+    """
+    构造 git 子进程环境
+
+    GIT_TERMINAL_PROMPT=0 防止网络调用挂在凭据提示上；
+    GIT_OPTIONAL_LOCKS=0 让只读查询跳过非必需的锁文件系统调用
+    """
+    return {
+        **os.environ,
+        "GIT_TERMINAL_PROMPT": "0",
+        "GIT_OPTIONAL_LOCKS": "0",
+        **extra
+    }
+
+
+def _default_remote(fn):
+    """
+    remote 参数缺省分发装饰器
+
+    self.remote 在 __init__ 之后不再变化，各检查方法开头重复的
+    "if remote is None: remote = self.remote" 收敛到这一个包装器；
+    remote 需以关键字形式传入
+    """
+    @functools.wraps(fn)
+    def wrapper(self, *args, remote=None, **kwargs):
+        return fn(self, *args,
+                  remote=remote if remote is not None else self.remote,
+                  **kwargs)
+    return wrapper
+
 # 导入 Git 工具类
 try:
     from git_utils import GitRemote
@@ -33,12 +85,14 @@ except ImportError:
             if GitRemote._remote_name_cache is not None:
                 return GitRemote._remote_name_cache
             try:
+                # 裸 git remote 只读 .git/config，不联网
+                #（remote show 在部分版本会查询远端）
                 result = subprocess.run(
-                    ["git", "remote", "show"],
+                    ["git", "remote"],
                     capture_output=True,
                     text=True,
                     check=False,
-                    timeout=30
+                    timeout=2
                 )
                 if result.returncode == 0 and result.stdout.strip():
                     remotes = result.stdout.strip().split("\n")
@@ -58,7 +112,9 @@ class PrecheckStatus(Enum):
     WARNING = "warning"
 
 
-@dataclass
+# slots 省掉每实例的 __dict__（属性读更快、内存约减半），
+# frozen 保证结果只读：批量路径替换列表元素而非原地修改
+@dataclass(slots=True, frozen=True)
 class PrecheckResult:
     """预检结果"""
     branch: str
@@ -66,11 +122,74 @@ class PrecheckResult:
     message: str
     details: Optional[str] = None
     can_merge: bool = True
+    remote_sha: Optional[str] = None
+    """预检时远程分支的提交 sha（来自 ls-remote，供调用方复用）"""
+
+
+class _RefCache:
+    """
+    远程分支表的磁盘缓存
+
+    进程内缓存救不了反复拉起本脚本的场景（pre-commit 钩子、CI 循环）；
+    把 {分支: sha} 表按远程 URL 哈希落盘到用户缓存目录，
+    TTL 内的后续进程可以零网络开销复用。ttl_s <= 0 时缓存关闭
+    """
+
+    CACHE_DIR = Path.home() / ".cache" / "git-merge-helper"
+
+    def __init__(self, url: Optional[str], ttl_s: float):
+        self.ttl_s = ttl_s
+        self.path: Optional[Path] = None
+
+        if ttl_s <= 0 or not url:
+            return
+
+        # 缓存键用远程 URL 而非远程名：不同仓库的 origin 互不串扰
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+        self.path = self.CACHE_DIR / f"refs-{digest}.json"
+
+    def load(self) -> Optional[Dict[str, str]]:
+        """读取缓存；过期、缺失或损坏时返回 None"""
+        if self.path is None:
+            return None
+        try:
+            if time.time() - self.path.stat().st_mtime >= self.ttl_s:
+                return None
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def store(self, heads: Dict[str, str]):
+        """原子写入缓存（tmp + rename，写失败静默放弃）"""
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.path.with_suffix(".json.tmp")
+            tmp_file.write_text(
+                json.dumps(heads, ensure_ascii=False),
+                encoding="utf-8"
+            )
+            os.replace(tmp_file, self.path)
+        except OSError:
+            pass
+
+    def invalidate(self):
+        """删除缓存文件（推送改变远程分支表后调用）"""
+        if self.path is None:
+            return
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
 
 
 class MergePrechecker:
     """合并预检器"""
 
+    # merge-tree --stdin 输出中紧跟状态位的树 OID（SHA-1/SHA-256）
+    _OID_RE = re.compile(rb"^[0-9a-f]{40,64}$")
+
     def __init__(self, config=None, remote: str = None):
         """
         初始化预检器
@@ -87,16 +206,242 @@ class MergePrechecker:
         else:
             self.network_timeout = 30  # 默认 30 秒
 
+        # 磁盘缓存 TTL 复用 ls_remote_cache_ttl 配置项（0 表示禁用）
+        self.ref_cache_ttl = getattr(config, "ls_remote_cache_ttl", 60) if config else 60
+        self._ref_caches: Dict[str, _RefCache] = {}
+
         # 自动检测远程名称
         if remote:
             self.remote = remote
         else:
             self.remote = GitRemote.get_remote_name()
 
+        # 批量预取的远程分支表：{remote: {branch: sha}}
+        self._remote_heads: Dict[str, Dict[str, str]] = {}
+
+        # 远程 URL 缓存：.git/config 内容在实例生命周期内不会变化
+        self._remote_urls: Dict[str, Optional[str]] = {}
+
+        # 检查结果备忘录：键含源分支 HEAD sha，源分支推进后自动失效；
+        # 每轮 precheck_all_branches 开始时清空，限制增长
+        self._memo: Dict[tuple, PrecheckResult] = {}
+        self._source_head: Optional[str] = None
+
+        # 本实例已整体 fetch 过的远程（每远程最多 fetch 一次）
+        self._fetched_remotes = set()
+
+        # SSH 连接复用：ControlMaster 让后续 git 网络调用共享同一条
+        # TCP/SSH 会话，省掉每次的握手+认证（冷启动数百毫秒）。
+        # 仅 POSIX 且用户未自定义 GIT_SSH_COMMAND 时启用；
+        # ControlPath 放在 ~/.ssh 下，目录不存在则不启用
+        if os.name == "posix" and "GIT_SSH_COMMAND" not in os.environ:
+            ssh_dir = Path.home() / ".ssh"
+            if ssh_dir.is_dir():
+                os.environ["GIT_SSH_COMMAND"] = (
+                    "ssh -o ControlMaster=auto"
+                    f" -o ControlPath={ssh_dir}/gmh-%r@%h:%p"
+                    " -o ControlPersist=60s"
+                )
+
+    @staticmethod
+    def _kill_process_group(process: subprocess.Popen):
+        """
+        终止子进程及其派生的孙进程
+
+        git 的网络调用会派生 ssh 等子进程；只杀 git 本身时挂死的
+        ssh 会变成孤儿继续存活。POSIX 下对整个进程组先 SIGTERM、
+        短暂等待后 SIGKILL；其他平台退化为直接 kill
+        """
+        if os.name == "posix":
+            try:
+                os.killpg(process.pid, signal.SIGTERM)
+            except (ProcessLookupError, PermissionError):
+                pass
+            try:
+                process.wait(timeout=1)
+                return
+            except subprocess.TimeoutExpired:
+                pass
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass
+        else:
+            process.kill()
+
+        try:
+            process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            pass
+
+    def _run_git(self, args: List[str], timeout: float = None,
+                 input_data: bytes = None, text: bool = True, env=None):
+        """
+        执行 git 子进程（带超时与进程组清理）
+
+        子进程放入独立进程组（start_new_session），超时后整组清理，
+        防止挂死的网络子进程在 CI / 常驻环境里日积月累
+
+        Args:
+            args: git 之后的参数列表
+            timeout: 超时秒数（None 表示不限时）
+            input_data: 写入 stdin 的字节（可选）
+            text: 是否以文本模式读取 stdout
+            env: 子进程环境（默认 _git_env()）
+
+        Returns:
+            (returncode, stdout)；超时或系统错误时 returncode 为 -1
+        """
+        popen_kwargs = dict(
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            stdin=subprocess.PIPE if input_data is not None else None,
+            text=text,
+            env=env if env is not None else _git_env()
+        )
+        if os.name == "posix":
+            popen_kwargs["start_new_session"] = True
+
+        try:
+            process = subprocess.Popen([_GIT] + args, **popen_kwargs)
+        except OSError:
+            return -1, "" if text else b""
+
+        try:
+            stdout, _ = process.communicate(input=input_data, timeout=timeout)
+            return process.returncode, stdout
+        except subprocess.TimeoutExpired:
+            self._kill_process_group(process)
+            return -1, "" if text else b""
+
+    def _ensure_fetched(self, remote: str):
+        """
+        批量预检前对远程做一次整体 fetch
+
+        逐分支惰性拉取要付 N 次网络协商；一次 --prune --no-tags
+        fetch 只协商一个包，之后 commits-ahead 等检查全部命中
+        本地引用，下游执行器的"远程未更新"跳过判断也随之生效。
+        每个实例每远程最多执行一次；失败不致命，
+        后续检查会各自暴露问题
+
+        Args:
+            remote: 远程名称
+        """
+        if remote in self._fetched_remotes:
+            return
+        self._fetched_remotes.add(remote)
+
+        self._run_git(
+            ["fetch", "--prune", "--no-tags", remote],
+            timeout=self.network_timeout
+        )
+
+    def _run_ls_remote(self, args: List[str]):
+        """
+        以 git 协议 v2 执行 ls-remote
+
+        默认协议（v0）要求服务端先广播仓库内全部引用；v2 协议只
+        流式返回匹配的引用，数千引用的大仓库可显著降低传输字节和
+        服务端开销。需要 git 2.18+，环境变量 GIT_PROTOCOL 作为旧版
+        客户端的兜底；调用失败时回退一次普通调用
+
+        Args:
+            args: ls-remote 之后的参数列表
+
+        Returns:
+            (returncode, stdout)
+        """
+        returncode, stdout = self._run_git(
+            ["-c", "protocol.version=2", "ls-remote"] + args,
+            timeout=self.network_timeout,
+            env=_git_env(GIT_PROTOCOL="version=2")
+        )
+
+        if returncode != 0:
+            # 旧版 git / 不支持 v2 的服务端：回退默认协议
+            returncode, stdout = self._run_git(
+                ["ls-remote"] + args,
+                timeout=self.network_timeout
+            )
+        return returncode, stdout
+
+    @_default_remote
+    def invalidate_ref_cache(self, remote: str = None):
+        """
+        失效某远程的分支表缓存（内存 + 磁盘 + 备忘录）
+
+        推送会改变远程分支表；成功推送后调用本方法，
+        避免陈旧缓存把新分支误判为"不存在"毒害下一轮预检
+
+        Args:
+            remote: 远程名称（可选，默认使用自动检测的远程）
+        """
+        self._remote_heads.pop(remote, None)
+
+        cache = self._ref_caches.pop(remote, None)
+        if cache is None:
+            cache = _RefCache(self._get_remote_url(remote), self.ref_cache_ttl)
+        cache.invalidate()
+
+        self._memo = {
+            key: value for key, value in self._memo.items()
+            if not (key[0] == "remote_exists" and key[2] == remote)
+        }
+
+    def _prefetch_remote_heads(self, remote: str) -> Optional[Dict[str, str]]:
+        """
+        一次 ls-remote 预取远程全部分支
+
+        逐分支 ls-remote 每次都重做进程启动、TCP 握手和引用协商；
+        一次不带过滤的 --heads 查询即可拿到所有分支，
+        N 次远程协商合并为 1 次
+
+        Args:
+            remote: 远程名称
+
+        Returns:
+            {分支名: sha}；ls-remote 失败时返回 None（不缓存），
+            调用方回退到逐分支查询
+        """
+        if remote in self._remote_heads:
+            return self._remote_heads[remote]
+
+        # 磁盘缓存命中时本进程零网络开销
+        cache = self._ref_caches.get(remote)
+        if cache is None:
+            cache = self._ref_caches[remote] = _RefCache(
+                self._get_remote_url(remote), self.ref_cache_ttl
+            )
+        cached = cache.load()
+        if cached is not None:
+            self._remote_heads[remote] = cached
+            return cached
+
+        returncode, stdout = self._run_ls_remote(["--heads", remote])
+
+        if returncode != 0:
+            return None
+
+        # 输出行格式: "<sha>\trefs/heads/<name>"
+        heads = {}
+        for line in stdout.splitlines():
+            parts = line.split("\t", 1)
+            if len(parts) == 2 and parts[1].startswith("refs/heads/"):
+                heads[parts[1][len("refs/heads/"):]] = parts[0]
+
+        self._remote_heads[remote] = heads
+        cache.store(heads)
+        return heads
+
+    @_default_remote
     def check_remote_branch_exists(self, branch: str, remote: str = None) -> PrecheckResult:
         """
         检查远程分支是否存在
 
+        若本 remote 的分支表已批量预取，则命中时直接查表；
+        查表未命中只加速不作数——分支表可能来自 TTL 内的磁盘缓存，
+        其间新推送的分支不在表里，宣告"不存在"前必须直查一次远程
+
         Args:
             branch: 分支名
             remote: 远程名称（可选，默认使用自动检测的远程）
@@ -104,25 +449,33 @@ class MergePrechecker:
         Returns:
             预检结果
         """
-        if remote is None:
-            remote = self.remote
-        result = subprocess.run(
-            ["git", "ls-remote", "--heads", remote, branch],
-            capture_output=True,
-            text=True,
-            check=False,
-            timeout=self.network_timeout
-        )
-
-        if result.returncode == 0 and result.stdout.strip():
-            return PrecheckResult(
+        memo_key = ("remote_exists", branch, remote, self._source_head)
+        cached = self._memo.get(memo_key)
+        if cached is not None:
+            return cached
+
+        heads = self._remote_heads.get(remote)
+        remote_sha = heads.get(branch) if heads is not None else None
+        if remote_sha is None:
+            # 缓存只信任正命中：未命中回退到单分支 ls-remote 确认
+            returncode, stdout = self._run_ls_remote(["--heads", remote, branch])
+            if returncode == 0 and stdout.strip():
+                # ls-remote 输出: "<sha>\t<ref>"，顺手记下远程 sha
+                remote_sha = stdout.split()[0]
+                if heads is not None:
+                    # 补录内存表，同一轮的重复查询不再打网络
+                    heads[branch] = remote_sha
+
+        if remote_sha is not None:
+            result = PrecheckResult(
                 branch=branch,
                 status=PrecheckStatus.SUCCESS,
                 message=f"远程分支 {remote}/{branch} 存在",
-                can_merge=True
+                can_merge=True,
+                remote_sha=remote_sha
             )
         else:
-            return PrecheckResult(
+            result = PrecheckResult(
                 branch=branch,
                 status=PrecheckStatus.ERROR,
                 message=f"远程分支 {remote}/{branch} 不存在",
@@ -130,30 +483,49 @@ class MergePrechecker:
                 can_merge=False
             )
 
-    def check_push_permission(self, branch: str, remote: str = None) -> PrecheckResult:
+        self._memo[memo_key] = result
+        return result
+
+    def _get_remote_url(self, remote: str) -> Optional[str]:
         """
-        检查推送权限（通过检查是否可以访问远程仓库）
+        获取远程 URL（实例级缓存）
+
+        读的只是 .git/config，一次子进程后缓存结果，
+        逐分支检查不再重复付进程启动开销
 
         Args:
-            branch: 分支名
-            remote: 远程名称（可选，默认使用自动检测的远程）
+            remote: 远程名称
 
         Returns:
-            预检结果
+            远程 URL，未配置时返回 None
         """
-        if remote is None:
-            remote = self.remote
+        if remote in self._remote_urls:
+            return self._remote_urls[remote]
 
-        # 尝试获取远程信息
-        result = subprocess.run(
-            ["git", "remote", "get-url", remote],
-            capture_output=True,
-            text=True,
-            check=False,
+        returncode, stdout = self._run_git(
+            ["config", "--get", f"remote.{remote}.url"],
             timeout=self.network_timeout
         )
 
-        if result.returncode == 0:
+        url = stdout.strip() if returncode == 0 else ""
+        self._remote_urls[remote] = url or None
+        return self._remote_urls[remote]
+
+    @_default_remote
+    def check_push_permission(self, branch: str, remote: str = None) -> PrecheckResult:
+        """
+        检查推送权限（通过检查远程仓库是否已配置）
+
+        结果来自缓存的 .git/config 读取，不再为每个分支启动子进程
+
+        Args:
+            branch: 分支名
+            remote: 远程名称（可选，默认使用自动检测的远程）
+
+        Returns:
+            预检结果
+        """
+        if self._get_remote_url(remote) is not None:
             return PrecheckResult(
                 branch=branch,
                 status=PrecheckStatus.SUCCESS,
@@ -169,6 +541,34 @@ class MergePrechecker:
                 can_merge=False
             )
 
+    def _count_commits_ahead_inprocess(self, source_branch: str,
+                                       target_branch: str) -> Optional[int]:
+        """
+        用 pygit2 在进程内统计 target..source 的提交数
+
+        libgit2 的拓扑遍历在当前进程内完成，省掉 fork+exec、
+        git-dir 发现和引用解析的每次启动开销
+
+        Args:
+            source_branch: 源分支
+            target_branch: 目标分支
+
+        Returns:
+            提交数；pygit2 不可用或解析失败时返回 None（回退子进程）
+        """
+        if pygit2 is None:
+            return None
+
+        try:
+            repo = pygit2.Repository(".")
+            source = repo.revparse_single(source_branch)
+            target = repo.revparse_single(target_branch)
+            walker = repo.walk(source.id, pygit2.GIT_SORT_TOPOLOGICAL)
+            walker.hide(target.id)
+            return sum(1 for _ in walker)
+        except (pygit2.GitError, KeyError, ValueError):
+            return None
+
     def check_commits_ahead(self, source_branch: str, target_branch: str) -> PrecheckResult:
         """
         检查是否有新提交需要合并
@@ -180,18 +580,29 @@ class MergePrechecker:
         Returns:
             预检结果
         """
-        result = subprocess.run(
-            ["git", "log", f"{target_branch}..{source_branch}", "--oneline"],
-            capture_output=True,
-            text=True,
-            check=False
-        )
+        memo_key = ("commits_ahead", source_branch, target_branch, self._source_head)
+        cached = self._memo.get(memo_key)
+        if cached is not None:
+            return cached
+
+        # 优先走 pygit2 进程内提交遍历（亚毫秒级，无 fork+exec）
+        count = self._count_commits_ahead_inprocess(source_branch, target_branch)
+
+        if count is None:
+            # rev-list --count 只回传一个整数，免去 O(提交数) 的
+            # --oneline 格式化输出和 Python 侧的逐行解析
+            _, stdout = self._run_git(
+                ["rev-list", "--count", f"{target_branch}..{source_branch}"],
+                timeout=self.network_timeout
+            )
 
-        commits = result.stdout.strip().split("\n") if result.stdout.strip() else []
-        commits = [c for c in commits if c.strip()]
+            try:
+                count = int(stdout.strip() or 0)
+            except ValueError:
+                count = 0
 
-        if len(commits) == 0:
-            return PrecheckResult(
+        if count == 0:
+            result = PrecheckResult(
                 branch=target_branch,
                 status=PrecheckStatus.WARNING,
                 message=f"没有需要合并的新提交",
@@ -199,14 +610,66 @@ class MergePrechecker:
                 can_merge=False
             )
         else:
+            result = PrecheckResult(
+                branch=target_branch,
+                status=PrecheckStatus.SUCCESS,
+                message=f"检测到 {count} 个新提交需要合并",
+                can_merge=True
+            )
+
+        self._memo[memo_key] = result
+        return result
+
+    def check_conflicts(self, source_branch: str, target_branch: str) -> PrecheckResult:
+        """
+        用 merge-tree 预测合并冲突
+
+        git merge-tree --write-tree（git 2.38+）在对象库内做三方合并，
+        不触碰工作区和索引，兑现模块文档承诺的"预测可能的冲突"，
+        免去用户真实 merge 再回滚的代价
+
+        Args:
+            source_branch: 源分支
+            target_branch: 目标分支
+
+        Returns:
+            预检结果：预测到冲突时为 WARNING（附冲突文件列表），
+            无冲突或旧版 git 无法判断时为 SUCCESS
+        """
+        returncode, stdout = self._run_git(
+            ["merge-tree", "--write-tree", "--name-only",
+             target_branch, source_branch],
+            timeout=self.network_timeout
+        )
+
+        # 退出码约定：0 无冲突，1 有冲突，其余（如旧版 git）无法判断
+        if returncode != 1:
             return PrecheckResult(
                 branch=target_branch,
                 status=PrecheckStatus.SUCCESS,
-                message=f"检测到 {len(commits)} 个新提交需要合并",
+                message="未预测到合并冲突",
                 can_merge=True
             )
 
-    def precheck_branch(self, branch: str, source_branch: str, remote: str = None) -> PrecheckResult:
+        # --name-only 输出：首行为树 OID，随后每行一个冲突文件名，
+        # 空行之后是提示性消息
+        files = []
+        for line in stdout.splitlines()[1:]:
+            if not line.strip():
+                break
+            files.append(line.strip())
+
+        return PrecheckResult(
+            branch=target_branch,
+            status=PrecheckStatus.WARNING,
+            message=f"预测到合并冲突 ({len(files)} 个文件)",
+            details="\n".join(f"  - {f}" for f in files),
+            can_merge=False
+        )
+
+    @_default_remote
+    def precheck_branch(self, branch: str, source_branch: str, remote: str = None,
+                        _probe_conflicts: bool = True) -> PrecheckResult:
         """
         对单个分支进行完整预检
 
@@ -214,32 +677,41 @@ class MergePrechecker:
             branch: 目标分支名
             source_branch: 源分支名
             remote: 远程名称（可选，默认使用自动检测的远程）
+            _probe_conflicts: 是否做单分支冲突预测；批量路径传 False，
+                由 precheck_all_branches 末尾的单进程批量预测统一覆盖
 
         Returns:
             预检结果
         """
-        if remote is None:
-            remote = self.remote
-        checks = [
-            self.check_remote_branch_exists(branch, remote),
-            self.check_push_permission(branch, remote),
-            self.check_commits_ahead(source_branch, branch)
-        ]
+        # 惰性执行：任何一项 ERROR 直接终止，后续检查
+        #（及其网络/子进程开销）不再发生
+        checks = []
+        remote_sha = None
+        for check in (
+            lambda: self.check_remote_branch_exists(branch, remote=remote),
+            lambda: self.check_push_permission(branch, remote=remote),
+            lambda: self.check_commits_ahead(source_branch, branch),
+        ):
+            result = check()
+            if not checks:
+                # 透传远程 sha，调用方可据此判断是否需要重新 fetch
+                remote_sha = result.remote_sha
+            if result.status == PrecheckStatus.ERROR:
+                return PrecheckResult(
+                    branch=branch,
+                    status=PrecheckStatus.ERROR,
+                    message=f"预检失败: {result.message}",
+                    details=f"  - {result.message}",
+                    can_merge=False,
+                    remote_sha=remote_sha
+                )
+            checks.append(result)
 
-        # 检查是否有错误
-        errors = [c for c in checks if c.status == PrecheckStatus.ERROR]
-        warnings = [c for c in checks if c.status == PrecheckStatus.WARNING]
+        # 有新提交才值得预测冲突（惰性：无提交/已出错时不跑 merge-tree）
+        if _probe_conflicts and checks[2].status == PrecheckStatus.SUCCESS:
+            checks.append(self.check_conflicts(source_branch, branch))
 
-        if errors:
-            # 有错误，不能合并
-            error_msg = "; ".join([e.message for e in errors])
-            return PrecheckResult(
-                branch=branch,
-                status=PrecheckStatus.ERROR,
-                message=f"预检失败: {error_msg}",
-                details="\n".join([f"  - {e.message}" for e in errors]),
-                can_merge=False
-            )
+        warnings = [c for c in checks if c.status == PrecheckStatus.WARNING]
 
         if warnings:
             # 有警告，但也可能可以合并（如没有新提交）
@@ -249,7 +721,8 @@ class MergePrechecker:
                 status=PrecheckStatus.WARNING,
                 message=warning_msg,
                 details="\n".join([f"  - {w.message}" for w in warnings]),
-                can_merge=False  # 没有新提交时也不合并
+                can_merge=False,  # 没有新提交时也不合并
+                remote_sha=remote_sha
             )
 
         # 所有检查通过
@@ -257,12 +730,71 @@ class MergePrechecker:
             branch=branch,
             status=PrecheckStatus.SUCCESS,
             message=f"预检通过，可以合并到 {branch}",
-            can_merge=True
+            can_merge=True,
+            remote_sha=remote_sha
         )
 
+    def predict_conflicts(self, source_branch: str,
+                          branches: List[str]) -> Dict[str, Optional[bool]]:
+        """
+        批量预测各目标分支与源分支合并是否冲突
+
+        所有分支对逐行喂给同一个 git merge-tree --stdin 子进程，
+        在对象库内模拟合并（不触碰工作区），N 对合并只付一次
+        fork+exec。输出按 "状态位 + 树 OID" 的记录头切分：
+        0 表示有冲突，1 表示干净
+
+        Args:
+            source_branch: 源分支名
+            branches: 目标分支列表
+
+        Returns:
+            {分支名: 是否冲突}；git 不支持 --stdin 或解析失败时
+            值为 None，调用方应忽略预测结果
+        """
+        if not branches:
+            return {}
+
+        input_data = "".join(
+            f"{branch} {source_branch}\n" for branch in branches
+        )
+        returncode, stdout = self._run_git(
+            ["merge-tree", "--stdin", "--name-only"],
+            timeout=self.network_timeout,
+            input_data=input_data.encode("utf-8"),
+            text=False
+        )
+
+        if returncode != 0:
+            return {branch: None for branch in branches}
+
+        # --stdin 隐含 -z：按 NUL 切分后，记录头是状态位（0/1）
+        # 紧跟一个树 OID；冲突文件名和提示消息段不会满足该形态
+        tokens = stdout.split(b"\0")
+        statuses = []
+        index = 0
+        while index < len(tokens) - 1:
+            if (tokens[index] in (b"0", b"1")
+                    and self._OID_RE.match(tokens[index + 1])):
+                statuses.append(tokens[index] == b"0")
+                index += 2
+            else:
+                index += 1
+
+        if len(statuses) != len(branches):
+            # 输出与输入对不上，放弃预测而非错误归属
+            return {branch: None for branch in branches}
+
+        return dict(zip(branches, statuses))
+
+    @_default_remote
     def precheck_all_branches(self, branches: List[str], source_branch: str, remote: str = None) -> List[PrecheckResult]:
         """
-        预检所有分支
+        预检所有分支（并行执行）
+
+        各分支的预检都是只读查询，相互独立，
+        线程池并发后总耗时约等于最慢的一个分支，
+        而非逐分支网络往返之和
 
         Args:
             branches: 目标分支列表
@@ -270,14 +802,49 @@ class MergePrechecker:
             remote: 远程名称（可选，默认使用自动检测的远程）
 
         Returns:
-            预检结果列表
+            预检结果列表（与 branches 顺序一致）
         """
-        if remote is None:
-            remote = self.remote
-        results = []
-        for branch in branches:
-            result = self.precheck_branch(branch, source_branch, remote)
-            results.append(result)
+        if not branches:
+            self.results = []
+            return []
+
+        # 每轮批量预检重置备忘录并重新锚定源分支 HEAD：
+        # 源分支推进后旧结果不会被误用，备忘录大小也有界
+        self._memo.clear()
+        _, head_out = self._run_git(
+            ["rev-parse", source_branch],
+            timeout=self.network_timeout
+        )
+        self._source_head = head_out.strip() or None
+
+        # 先批量预取远程分支表，线程里的存在性检查全部走本地查表；
+        # 再整体 fetch 一次，让后续检查命中最新的本地引用
+        self._prefetch_remote_heads(remote)
+        self._ensure_fetched(remote)
+
+        # executor.map 保持输入顺序，结果仍与 branches 一一对应
+        with ThreadPoolExecutor(max_workers=min(8, len(branches))) as pool:
+            results = list(pool.map(
+                lambda branch: self.precheck_branch(
+                    branch, source_branch, remote=remote,
+                    _probe_conflicts=False
+                ),
+                branches
+            ))
+
+        # 对通过预检的分支批量做冲突预测（一个 merge-tree 子进程）
+        mergeable = [r.branch for r in results if r.can_merge]
+        predictions = self.predict_conflicts(source_branch, mergeable)
+        for i, r in enumerate(results):
+            if r.can_merge and predictions.get(r.branch) is True:
+                results[i] = PrecheckResult(
+                    branch=r.branch,
+                    status=PrecheckStatus.ERROR,
+                    message=f"预测到合并冲突: {source_branch} -> {r.branch}",
+                    details="merge-tree 模拟合并发现冲突，请先手动处理",
+                    can_merge=False,
+                    remote_sha=r.remote_sha
+                )
 
         self.results = results
         return results
@@ -289,10 +856,16 @@ class MergePrechecker:
         Returns:
             汇总信息字典
         """
+        # 单次遍历同时累加三个计数器，替代三个独立的生成器扫描
         total = len(self.results)
-        success = sum(1 for r in self.results if r.status == PrecheckStatus.SUCCESS and r.can_merge)
-        errors = sum(1 for r in self.results if r.status == PrecheckStatus.ERROR or not r.can_merge)
-        warnings = sum(1 for r in self.results if r.status == PrecheckStatus.WARNING)
+        success = errors = warnings = 0
+        for r in self.results:
+            if r.status is PrecheckStatus.SUCCESS and r.can_merge:
+                success += 1
+            if r.status is PrecheckStatus.ERROR or not r.can_merge:
+                errors += 1
+            if r.status is PrecheckStatus.WARNING:
+                warnings += 1
 
         return {
             "total": total,